@@ -0,0 +1,51 @@
+"""Compare per-save commit latency with SQLite defaults and with SQLITE_PRAGMAS.
+
+Each save adds one faculty member and one course through UnitOfWork and
+commits, the same way add_faculty/add_course do in the application.
+
+    python benchmarks/bench_commit_latency.py [--saves 500]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from facload import Course, Faculty, UnitOfWork, connect_database, migrate_database
+
+CONFIGURATIONS = {
+    'defaults (rollback journal)': {name: None for name in ('journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store')},
+    'tuned (SQLITE_PRAGMAS)': {},
+}
+
+def run(pragmas, saves):
+    with tempfile.TemporaryDirectory() as directory:
+        connection = connect_database(os.path.join(directory, 'bench.db'), pragmas)
+        migrate_database(connection)
+        unit_of_work = UnitOfWork()
+        latencies = []
+        for i in range(saves):
+            faculty = Faculty(f"Faculty {i}", "Full-time MA")
+            unit_of_work.register_new(faculty)
+            unit_of_work.register_new(Course(f"Course {i}", "BA 1", 3, "MW 07:40am-09:10am"), faculty)
+            start = time.perf_counter()
+            unit_of_work.commit(connection)
+            latencies.append((time.perf_counter() - start) * 1000)
+        connection.close()
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1], sum(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--saves', type=int, default=500)
+    args = parser.parse_args()
+    print(f"{'configuration':<30} {'p50 ms':>8} {'p95 ms':>8} {'total ms':>10}")
+    for label, pragmas in CONFIGURATIONS.items():
+        p50, p95, total = run(pragmas, args.saves)
+        print(f"{label:<30} {p50:>8.3f} {p95:>8.3f} {total:>10.1f}")
+
+if __name__ == '__main__':
+    main()
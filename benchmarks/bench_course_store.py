@@ -0,0 +1,57 @@
+"""Compare report aggregations over faculty_list with the CourseStore columns.
+
+Per-faculty units, per-year-level units and per-schedule counts are computed
+once by iterating Course objects and once as NumPy reductions over
+COURSE_STORE, and the results are checked to agree.
+
+    python benchmarks/bench_course_store.py [--faculty 10000] [--courses 100000]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from facload import COURSE_STORE
+from bench_course_table import roster
+
+def by_objects(faculty_list):
+    loads = [sum(course.units for course in faculty.courses) for faculty in faculty_list]
+    year_units = Counter()
+    schedules = Counter()
+    for faculty in faculty_list:
+        for course in faculty.courses:
+            year_units[course.year_level] += course.units
+            schedules[course.schedule] += 1
+    return loads, dict(year_units), dict(schedules)
+
+def by_columns(faculty_list):
+    loads = COURSE_STORE.faculty_loads(faculty_list).tolist()
+    return loads, COURSE_STORE.year_level_units(), COURSE_STORE.schedule_counts()
+
+def best_of(function, faculty_list, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(faculty_list)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--faculty', type=int, default=10000)
+    parser.add_argument('--courses', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    faculty_list = roster(args.faculty, args.courses)
+    objects, expected = best_of(by_objects, faculty_list, args.repeat)
+    columns, result = best_of(by_columns, faculty_list, args.repeat)
+    assert result == expected, "column aggregations disagree with the object walk"
+    print(f"{args.faculty} faculty, {args.courses} courses")
+    print(f"iterating faculty_list: {objects * 1000:8.2f} ms")
+    print(f"CourseStore columns:    {columns * 1000:8.2f} ms ({objects / columns:.1f}x)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Compare building course-table rows with the old owner scan and with Course.faculty.
+
+The old update_course_table located each course's faculty with
+next(f for f in faculty_list if course in f.courses), which is quadratic in the
+number of courses. It is timed on a sample and extrapolated to the full
+roster; the back-reference pass is timed over every course.
+
+    python benchmarks/bench_course_table.py [--faculty 2000] [--courses 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from facload import CLASSIFICATIONS, SCHEDULES, UNITS, YEAR_LEVELS, Course, Faculty
+
+def roster(faculty_count, course_count, seed=0):
+    rng = random.Random(seed)
+    faculty_list = [Faculty(f"Faculty {i}", rng.choice(CLASSIFICATIONS)) for i in range(faculty_count)]
+    for i in range(course_count):
+        rng.choice(faculty_list).add_course(Course(f"Course {i}", rng.choice(YEAR_LEVELS), rng.choice(UNITS), rng.choice(SCHEDULES)))
+    return faculty_list
+
+def row(faculty, course):
+    return (faculty.name, course.name, course.year_level, str(course.units), course.schedule)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--faculty', type=int, default=2000)
+    parser.add_argument('--courses', type=int, default=20000)
+    parser.add_argument('--sample', type=int, default=200)
+    args = parser.parse_args()
+    faculty_list = roster(args.faculty, args.courses)
+    courses = [course for faculty in faculty_list for course in faculty.courses]
+
+    sample = random.Random(1).sample(courses, min(args.sample, len(courses)))
+    start = time.perf_counter()
+    for course in sample:
+        row(next(f for f in faculty_list if course in f.courses), course)
+    scan = (time.perf_counter() - start) / len(sample) * len(courses)
+
+    start = time.perf_counter()
+    rows = [row(course.faculty, course) for course in courses]
+    linear = time.perf_counter() - start
+
+    print(f"{len(courses)} courses across {len(faculty_list)} faculty")
+    print(f"owner scan (extrapolated from {len(sample)}): {scan:10.3f}s")
+    print(f"Course.faculty back-reference:        {linear:10.3f}s ({len(rows)} rows)")
+    print(f"speedup: {scan / linear:.0f}x")
+
+if __name__ == '__main__':
+    main()
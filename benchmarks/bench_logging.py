@@ -0,0 +1,55 @@
+"""Compare the per-message cost of the old write_debug with the queued logger.
+
+write_debug opened the log file, appended one line and closed it on every
+call. The queued logger only hands the record to a QueueListener thread; the
+file write happens off the calling thread. Both write to a temporary
+directory. The timings also cover messages below the configured level and
+logging switched off.
+
+    python benchmarks/bench_logging.py [--messages 20000]
+"""
+import argparse
+import datetime
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from facload.diagnostics import start_logging, stop_logging
+
+def write_debug(log_path, message):
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with open(log_path, 'a') as f:
+        f.write(f"{timestamp} - {message}\n")
+
+def per_message(function, messages):
+    start = time.perf_counter()
+    for i in range(messages):
+        function(f"Saving CSV to: export-{i}.csv")
+    return (time.perf_counter() - start) / messages * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=20000)
+    args = parser.parse_args()
+    logger = logging.getLogger('facload.bench')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'debug.log')
+        rows = [("write_debug (open/append/close)", per_message(lambda message: write_debug(path, message), args.messages))]
+        start_logging(path, level='INFO')
+        rows.append(("logger.info, queued", per_message(logger.info, args.messages)))
+        rows.append(("logger.debug below level", per_message(logger.debug, args.messages)))
+        start = time.perf_counter()
+        stop_logging()
+        drain = time.perf_counter() - start
+        start_logging(path, level='OFF')
+        rows.append(("logger.info, logging off", per_message(logger.info, args.messages)))
+    for label, micros in rows:
+        print(f"{label:<34} {micros:8.2f} us/message")
+    print(f"queue drained at shutdown in {drain * 1000:.1f} ms")
+
+if __name__ == '__main__':
+    main()
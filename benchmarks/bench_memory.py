@@ -0,0 +1,54 @@
+"""Measure bytes per course for a large roster loaded from SQLite.
+
+Rows come straight from a generated database, so every string is a fresh
+object as it is in load_data_from_db. The baseline is a dict-backed class
+shaped like Course before it gained __slots__ and the CourseStore.
+
+    python benchmarks/bench_memory.py [--courses 100000]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from facload import Course
+from generate_data import generate_database
+
+class DictCourse:
+    def __init__(self, name, year_level, units, schedule, id=None):
+        self.id = id
+        self.faculty = None
+        self.name = name
+        self.year_level = year_level
+        self.units = units
+        self.schedule = schedule
+
+def bytes_per_course(path, course_class):
+    connection = sqlite3.connect(path)
+    tracemalloc.start()
+    rows = connection.execute("SELECT id, name, year_level, units, schedule FROM courses")
+    courses = [course_class(name, year_level, units, schedule, id=id) for id, name, year_level, units, schedule in rows]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    connection.close()
+    return allocated / len(courses)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--courses', type=int, default=100000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'memory.db')
+        generate_database(path, faculty=max(args.courses // 10, 1), courses=args.courses)
+        before = bytes_per_course(path, DictCourse)
+        after = bytes_per_course(path, Course)
+    print(f"{args.courses} courses")
+    print(f"dict-backed course:      {before:8.1f} bytes/course")
+    print(f"store-backed Course:     {after:8.1f} bytes/course ({(1 - after / before) * 100:.0f}% less)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""Measure wall-clock speedup of solve_assignment_parallel as worker processes are added.
+
+The total number of restarts is fixed, so the work is the same for every row
+and only its spread over cores changes.
+
+    python benchmarks/bench_parallel_solver.py [--faculty 2000] [--sections 20000] [--restarts 16]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from facload import AssignmentProblem, solve_assignment_parallel
+from bench_solver import synthetic_term
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--faculty', type=int, default=2000)
+    parser.add_argument('--sections', type=int, default=20000)
+    parser.add_argument('--restarts', type=int, default=16)
+    parser.add_argument('--rounds', type=int, default=2)
+    args = parser.parse_args()
+    problem = AssignmentProblem(*synthetic_term(args.faculty, args.sections))
+    cores = os.cpu_count() or 1
+    counts = sorted({1, *[2 ** k for k in range(1, cores.bit_length()) if 2 ** k <= cores], cores})
+    print(f"{args.faculty} faculty, {args.sections} sections, {args.restarts} restarts x {args.rounds} rounds")
+    print(f"{'workers':>7} {'wall s':>8} {'speedup':>8}  best score")
+    baseline = None
+    for workers in counts:
+        start = time.perf_counter()
+        best = solve_assignment_parallel(problem, workers=workers, restarts=args.restarts, rounds=args.rounds)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>7} {elapsed:>8.2f} {baseline / elapsed:>7.2f}x  {best.score()}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""Time the application's hot paths at growing data sizes and save the results as JSON.
+
+For every size a fresh database is generated with generate_data.py (one
+faculty member per ten courses) and opened in an offscreen FacultyWorkloadApp;
+data operations go through its WorkloadService and the table refreshes through
+the window. load_data_from_db includes rebuilding the conflict indexes.
+An operation is skipped at larger sizes once it has taken longer than
+--budget seconds, so quadratic paths do not stall the run.
+
+    python benchmarks/bench_scaling.py [--sizes 100 1000 10000 100000] [--output bench_results.json]
+    python benchmarks/bench_scaling.py --compare bench_results.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from facload import SCHEDULES, YEAR_LEVELS, Course
+from main import FacultyWorkloadApp
+from generate_data import generate_database
+
+OPERATIONS = [
+    'load_data_from_db', 'save_data_to_db', 'check_schedule_conflict',
+    'update_faculty_table', 'update_course_table', 'export_csv', 'export_pdf',
+]
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def measure(window, operation, directory, rng):
+    service = window.service
+    if operation == 'load_data_from_db':
+        return timed(service.load)
+    if operation == 'save_data_to_db':
+        # Rename 1% of the courses and add one course per 100 faculty, then wait
+        # for the writer thread to commit them.
+        courses = [course for faculty in service.faculty_list for course in faculty.courses]
+        for course in rng.sample(courses, max(len(courses) // 100, 1)):
+            course.name += "*"
+            service.unit_of_work.register_dirty(course)
+        for faculty in rng.sample(service.faculty_list, max(len(service.faculty_list) // 100, 1)):
+            service.unit_of_work.register_new(Course("Benchmark", rng.choice(YEAR_LEVELS), 3, rng.choice(SCHEDULES)), faculty)
+        return timed(service.flush)
+    if operation == 'check_schedule_conflict':
+        # Average over 1000 probes.
+        probes = [(rng.choice(service.faculty_list), Course("Probe", rng.choice(YEAR_LEVELS), 3, rng.choice(SCHEDULES)))
+                  for _ in range(1000)]
+        return timed(lambda: [service.check_schedule_conflict(faculty, course) for faculty, course in probes]) / len(probes)
+    if operation == 'export_csv':
+        return timed(lambda: service.write_csv(os.path.join(directory, 'export.csv')))
+    if operation == 'export_pdf':
+        return timed(lambda: service.write_pdf(os.path.join(directory, 'export.pdf')))
+    return timed(getattr(window, operation))
+
+def run(sizes, budget):
+    results = {}
+    over_budget = set()
+    rng = random.Random(0)
+    for size in sizes:
+        results[str(size)] = timings = {}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'faculty_workload.db')
+            generate_database(path, faculty=max(size // 10, 1), courses=size)
+            window = FacultyWorkloadApp(path)
+            for operation in OPERATIONS:
+                if operation in over_budget:
+                    timings[operation] = None
+                    print(f"{size:>7} {operation:<24} skipped")
+                    continue
+                seconds = measure(window, operation, directory, rng)
+                timings[operation] = seconds
+                print(f"{size:>7} {operation:<24} {seconds:>12.6f}s")
+                if seconds > budget:
+                    over_budget.add(operation)
+            window.service.close()
+    return results
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+    print(f"\n{'size':>7} {'operation':<24} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for size, timings in results.items():
+        for operation, seconds in timings.items():
+            before = baseline.get(size, {}).get(operation)
+            if before and seconds:
+                print(f"{size:>7} {operation:<24} {before:>10.6f} {seconds:>10.6f} {seconds / before:>6.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--budget', type=float, default=60.0,
+                        help="skip an operation at larger sizes once it takes longer than this")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help="earlier results file to compare against")
+    args = parser.parse_args()
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = run(args.sizes, args.budget)
+    with open(args.output, 'w') as f:
+        json.dump({
+            'meta': {
+                'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'sizes': args.sizes,
+            },
+            'results': results,
+        }, f, indent=2)
+    print(f"Results written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Time solve_assignment on a synthetic term of unassigned sections.
+
+Sections are spread over many programme year levels, so year-level clashes
+reject only part of them, as in a real college-wide term.
+
+    python benchmarks/bench_solver.py [--faculty 2000] [--sections 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from facload import CLASSIFICATIONS, SCHEDULES, UNITS, AssignmentProblem, Course, Faculty, solve_assignment
+
+def synthetic_term(faculty_count, section_count, seed=1):
+    rng = random.Random(seed)
+    faculty_list = [Faculty(f"Faculty {i}", rng.choice(CLASSIFICATIONS), rng.random() < 0.1) for i in range(faculty_count)]
+    year_levels = [f"Program {p} {year}" for p in range(max(section_count // 40, 1)) for year in range(1, 5)]
+    offerings = [Course(f"Section {i}", rng.choice(year_levels), rng.choice(UNITS), rng.choice(SCHEDULES))
+                 for i in range(section_count)]
+    return faculty_list, offerings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--faculty', type=int, default=2000)
+    parser.add_argument('--sections', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    faculty_list, offerings = synthetic_term(args.faculty, args.sections, args.seed)
+    start = time.perf_counter()
+    problem = AssignmentProblem(faculty_list, offerings)
+    built = time.perf_counter()
+    solution = solve_assignment(problem, seed=args.seed)
+    solved = time.perf_counter()
+    print(f"{args.faculty} faculty, {args.sections} sections")
+    print(f"build {built - start:.3f}s, solve {solved - built:.3f}s")
+    print(f"unplaced {solution.unplaced}, shortfall {solution.shortfall} units, overload {solution.overload} units")
+
+if __name__ == '__main__':
+    main()
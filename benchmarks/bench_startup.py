@@ -0,0 +1,63 @@
+"""Measure import time of the application and the CLI with python -X importtime.
+
+Each target is imported in a fresh interpreter --runs times and the fastest
+cumulative time is kept, alongside the slowest modules it pulled in. The run
+fails (exit status 1) when a target is over its budget, so it can gate
+changes that add work at startup. The default budgets leave about 15% over
+the times measured once reportlab became a lazy import and the logging
+package replaced write_debug (about 155 ms and 120 ms).
+
+    python benchmarks/bench_startup.py [--runs 5] [--budget-ms 175] [--cli-budget-ms 140]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_times(module):
+    """Module -> (self us, cumulative us) for one cold import of module."""
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen', PYTHONDONTWRITEBYTECODE='1')
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+def measure(module, runs):
+    best = None
+    for _ in range(runs):
+        times = import_times(module)
+        if best is None or times[module][1] < best[module][1]:
+            best = times
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=175.0, help="budget for import main")
+    parser.add_argument('--cli-budget-ms', type=float, default=140.0, help="budget for import facload.cli")
+    parser.add_argument('--top', type=int, default=8, help="slowest modules to list per target")
+    args = parser.parse_args()
+    over = False
+    for module, budget in (('main', args.budget_ms), ('facload.cli', args.cli_budget_ms)):
+        times = measure(module, args.runs)
+        total = times[module][1] / 1000
+        status = "ok" if total <= budget else "OVER BUDGET"
+        over = over or total > budget
+        print(f"import {module}: {total:.1f} ms (budget {budget:.0f} ms) {status}")
+        for name, (own, _) in sorted(times.items(), key=lambda item: -item[1][0])[:args.top]:
+            print(f"    {own / 1000:8.1f} ms  {name}")
+        for heavy in ('reportlab', 'PyQt5'):
+            spent = sum(own for name, (own, _) in times.items() if name == heavy or name.startswith(heavy + '.'))
+            if spent:
+                print(f"    {heavy}.* imported: {spent / 1000:.1f} ms")
+    return 1 if over else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
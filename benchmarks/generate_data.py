@@ -0,0 +1,86 @@
+"""Fill a database with synthetic faculty and courses.
+
+Faculty, classifications, year levels and schedules are drawn at random from
+the application's own lists. Year levels beyond the six built-in ones are
+named "Program <n> <year>". The data is not kept conflict-free. Any faculty
+and courses already in the output are replaced, so a database that has some
+is only overwritten with --force.
+
+    python benchmarks/generate_data.py --faculty 1000 --courses 10000 --output synthetic.db
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from facload import CLASSIFICATIONS, SCHEDULES, UNITS, YEAR_LEVELS, connect_database, migrate_database, parse_schedule
+
+def year_level_names(count):
+    names = YEAR_LEVELS[:count]
+    program = 1
+    while len(names) < count:
+        names += [f"Program {program} {year}" for year in range(1, 5)][:count - len(names)]
+        program += 1
+    return names
+
+def has_data(path):
+    if not os.path.exists(path):
+        return False
+    connection = connect_database(path)
+    try:
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        return any(connection.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone()
+                   for table in ('faculty', 'courses') if table in tables)
+    finally:
+        connection.close()
+
+def generate_database(path, faculty=100, courses=1000, classifications=len(CLASSIFICATIONS),
+                      year_levels=len(YEAR_LEVELS), schedules=len(SCHEDULES), unassigned=0.0, seed=0):
+    rng = random.Random(seed)
+    classification_names = CLASSIFICATIONS[:classifications]
+    year_names = year_level_names(year_levels)
+    schedule_names = SCHEDULES[:schedules]
+    connection = connect_database(path)
+    migrate_database(connection)
+    with connection:
+        connection.execute("DELETE FROM courses")
+        connection.execute("DELETE FROM faculty")
+        connection.executemany(
+            "INSERT INTO faculty (id, name, classification, is_admin) VALUES (?, ?, ?, ?)",
+            [(i, f"Faculty {i:06d}", rng.choice(classification_names), rng.random() < 0.1) for i in range(1, faculty + 1)]
+        )
+        rows = []
+        for i in range(1, courses + 1):
+            schedule = rng.choice(schedule_names)
+            faculty_id = None if rng.random() < unassigned else rng.randint(1, faculty)
+            rows.append((i, faculty_id, f"Course {i:06d}", rng.choice(year_names), rng.choice(UNITS), schedule, *parse_schedule(schedule)))
+        connection.executemany(
+            '''INSERT INTO courses (id, faculty_id, name, year_level, units, schedule, days, start_minute, end_minute)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+            rows
+        )
+    connection.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', required=True, help="database file to fill")
+    parser.add_argument('--force', action='store_true', help="replace the faculty and courses already in --output")
+    parser.add_argument('--faculty', type=int, default=100)
+    parser.add_argument('--courses', type=int, default=1000)
+    parser.add_argument('--classifications', type=int, default=len(CLASSIFICATIONS),
+                        help="use the first N classifications")
+    parser.add_argument('--year-levels', type=int, default=len(YEAR_LEVELS))
+    parser.add_argument('--schedules', type=int, default=len(SCHEDULES), help="use the first N schedules")
+    parser.add_argument('--unassigned', type=float, default=0.0, help="fraction of courses left unassigned")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    if not args.force and has_data(args.output):
+        parser.error(f"{args.output} already holds faculty or courses; pass --force to replace them")
+    generate_database(args.output, args.faculty, args.courses, args.classifications,
+                      args.year_levels, args.schedules, args.unassigned, args.seed)
+    print(f"Wrote {args.faculty} faculty and {args.courses} courses to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+"""Faculty workload core: the roster, schedule rules, storage and exports, without Qt.
+
+main.py is the PyQt5 front end over WorkloadService; batch jobs and
+benchmarks can import this package on its own.
+"""
+from .audit import Conflict, audit_conflicts
+from .conflicts import ConflictIndex, OccupancyMatrix
+from .diagnostics import start_logging, stop_logging
+from .importer import BulkImporter, ImportIssue, ImportResult
+from .models import (CLASSIFICATIONS, COURSE_STORE, SCHEDULES, UNITS, YEAR_LEVELS, Course, CourseStore, Faculty,
+                     TimeSlot, normalize_name, parse_schedule)
+from .service import Alternative, CourseTotals, WorkloadService
+from .solver import Assignment, AssignmentProblem, solve_assignment, solve_assignment_parallel
+from .storage import (DATABASE_PATH, DatabaseWriter, UnitOfWork, connect_database, migrate_database,
+                      refresh_time_slots)
+from .timing import TIMINGS, Timer, Timings, timed
@@ -0,0 +1,90 @@
+"""Whole-database conflict audit."""
+import heapq
+from collections import namedtuple
+
+from .models import TimeSlot
+
+AuditCourse = namedtuple('AuditCourse', ['id', 'faculty', 'name', 'year_level', 'schedule'])
+
+FACULTY_DOUBLE_BOOKING = "Faculty double-booking"
+YEAR_LEVEL_CLASH = "Year-level clash"
+FACULTY_YEAR_LEVEL_DAY = "Same year level twice in a day"
+
+class Conflict(namedtuple('Conflict', ['kind', 'first', 'second'])):
+    __slots__ = ()
+
+    def describe(self):
+        return (f"{self.kind}: {self.first.faculty or '(unassigned)'} - {self.first.name} "
+                f"({self.first.year_level}, {self.first.schedule}) and {self.second.faculty or '(unassigned)'} - "
+                f"{self.second.name} ({self.second.year_level}, {self.second.schedule})")
+
+def _sweep(intervals):
+    # intervals are (group, day, start, end, row) tuples in sorted order; every
+    # interval still active when a new one starts overlaps it.
+    active = []
+    group = None
+    for key, day, start, end, row in intervals:
+        if (key, day) != group:
+            group = (key, day)
+            active = []
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for _, other in active:
+            yield other, row
+        heapq.heappush(active, (end, row))
+
+def audit_conflicts(connection):
+    """Scan every stored course once and return all conflicts, sorted by kind and course.
+
+    Each course is expanded into one interval per meeting day; sorting those and
+    sweeping each faculty/day and year-level/day group finds every clash in
+    O(n log n + conflicts). Slots are read from the days/start_minute/end_minute
+    columns; run storage.refresh_time_slots first if rows may have been edited
+    outside the application.
+    """
+    rows = connection.execute('''
+        SELECT c.id, f.name, c.name, c.year_level, c.schedule, c.faculty_id, c.days, c.start_minute, c.end_minute
+        FROM courses c
+        LEFT JOIN faculty f ON f.id = c.faculty_id
+    ''').fetchall()
+    year_codes = {}
+    meetings = {}
+    years = []
+    faculty_intervals = []
+    year_intervals = []
+    for row, (_, _, _, year_level, _, faculty_id, *slot) in enumerate(rows):
+        slot = TimeSlot(*slot)
+        if slot not in meetings:
+            meetings[slot] = [(day, slot.start, slot.end) for day in slot.each_day()]
+        year = year_codes.setdefault(year_level, len(year_codes))
+        years.append(year)
+        for day, start, end in meetings[slot]:
+            year_intervals.append((year, day, start, end, row))
+            if faculty_id is not None:
+                faculty_intervals.append((faculty_id, day, start, end, row))
+    faculty_intervals.sort()
+    year_intervals.sort()
+
+    found = {}
+    for first, second in _sweep(faculty_intervals):
+        found.setdefault((first, second), FACULTY_DOUBLE_BOOKING)
+    for first, second in _sweep(year_intervals):
+        # Overlaps within one faculty member are already reported as double-bookings.
+        if rows[first][5] != rows[second][5] or rows[first][5] is None:
+            found.setdefault((first, second), YEAR_LEVEL_CLASH)
+    # A faculty member may not meet the same year level twice on one day.
+    seen = {}
+    group = None
+    for faculty_id, day, _, _, row in faculty_intervals:
+        if (faculty_id, day) != group:
+            group = (faculty_id, day)
+            seen = {}
+        for other in seen.setdefault(years[row], []):
+            found.setdefault((other, row), FACULTY_YEAR_LEVEL_DAY)
+        seen[years[row]].append(row)
+
+    conflicts = {}
+    for (first, second), kind in found.items():
+        first, second = sorted((first, second))
+        conflicts.setdefault((first, second), Conflict(kind, AuditCourse(*rows[first][:5]), AuditCourse(*rows[second][:5])))
+    return sorted(conflicts.values(), key=lambda conflict: (conflict.kind, conflict.first.id, conflict.second.id))
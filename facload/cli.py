@@ -0,0 +1,173 @@
+"""Command-line batch operations on a faculty workload database.
+
+    python -m facload [-d DATABASE] import FILE...
+    python -m facload [-d DATABASE] audit
+    python -m facload [-d DATABASE] report [--summary]
+    python -m facload [-d DATABASE] export-csv FILE
+    python -m facload [-d DATABASE] export-pdf FILE
+    python -m facload [-d DATABASE] assign [--time-limit SECONDS]
+
+--timings FILE writes how long the load, saves, exports and other steps took
+as JSON, for attaching to a support ticket.
+
+Results are printed as they are produced. The exit status is 0 on success,
+1 when the run finished but found something to act on (conflicts, rejected
+rows, offerings left unplaced) and 2 when it could not run at all.
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+
+from .audit import audit_conflicts
+from .diagnostics import start_logging
+from .service import WorkloadService
+from .storage import DATABASE_PATH, connect_database, refresh_time_slots
+from .timing import TIMINGS, timed
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_FINDINGS = 1
+EXIT_ERROR = 2
+
+def _import(service, args):
+    rejected = 0
+    for path in args.files:
+        result = service.import_csv(path)
+        for issue in result.issues:
+            print(f"{path}:{issue.line}: {issue.message}")
+        print(f"{path}: imported {len(result.faculty)} faculty and {len(result.courses)} courses, rejected {len(result.issues)} rows.")
+        rejected += len(result.issues)
+    return EXIT_FINDINGS if rejected else EXIT_OK
+
+def _report(service, args):
+    print("\t".join(["Name", "Classification", "Admin", "Current Load", "Required Load", "Status"]))
+    for faculty in service.faculty_list:
+        print("\t".join([faculty.name, faculty.classification, "Yes" if faculty.is_admin else "No",
+                         str(faculty.current_load()), str(faculty.required_load), faculty.load_status()]))
+    if args.summary:
+        print()
+        print("Year Level\tCourses\tUnits")
+        totals = service.course_totals()
+        for year_level, units in sorted(totals.year_level_units.items()):
+            print(f"{year_level}\t{totals.year_level_counts.get(year_level, 0)}\t{units}")
+        print()
+        print("Schedule\tCourses")
+        for schedule, count in sorted(totals.schedule_counts.items()):
+            print(f"{schedule}\t{count}")
+        print()
+        print(f"Unassigned units\t{totals.unassigned_units}")
+    return EXIT_OK
+
+def _export_csv(service, args):
+    service.write_csv(args.file)
+    print(f"Data exported to CSV: {args.file}")
+    return EXIT_OK
+
+def _export_pdf(service, args):
+    service.write_pdf(args.file)
+    print(f"Data exported to PDF: {args.file}")
+    return EXIT_OK
+
+def _assign(service, args):
+    offerings = list(service.unassigned_courses)
+    solution = service.auto_assign(time_limit=args.time_limit)
+    if solution is None:
+        print("There are no unassigned offerings.")
+        return EXIT_OK
+    for course, index in zip(offerings, solution.faculty_of):
+        if index >= 0:
+            print(f"{course.name} ({course.year_level}, {course.schedule}) -> {course.faculty.name}")
+    print(f"Assigned {len(offerings) - solution.unplaced} of {len(offerings)} offerings;"
+          f" {solution.unplaced} could not be placed without a conflict."
+          f" Remaining shortfall: {solution.shortfall} units. Overload: {solution.overload} units.")
+    return EXIT_FINDINGS if solution.unplaced else EXIT_OK
+
+@timed('audit')
+def _audit(path):
+    # Straight from the database; no need to load the roster.
+    connection = connect_database(path)
+    try:
+        refresh_time_slots(connection)
+        conflicts = audit_conflicts(connection)
+    finally:
+        connection.close()
+    for conflict in conflicts:
+        print(conflict.describe())
+    print(f"{len(conflicts)} conflicts found in {path}.")
+    return EXIT_FINDINGS if conflicts else EXIT_OK
+
+def _run(args):
+    try:
+        if args.run is None:
+            return _audit(args.database)
+        service = WorkloadService(args.database)
+        try:
+            status = args.run(service, args)
+        finally:
+            if not service.close():
+                print("Some changes could not be saved.", file=sys.stderr)
+                status = EXIT_ERROR
+        return status
+    except (OSError, sqlite3.Error, ValueError) as e:
+        logger.exception(f"Error in command {args.command}: {str(e)}")
+        print(f"{args.command} failed: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    except Exception as e:
+        # Anything else is a bug, but cron must still see EXIT_ERROR rather
+        # than the interpreter's 1, which means findings.
+        logger.exception(f"Unexpected error in command {args.command}: {str(e)}")
+        print(f"{args.command} failed unexpectedly: {type(e).__name__}: {e} (details in the debug log)", file=sys.stderr)
+        return EXIT_ERROR
+
+def _positive_seconds(value):
+    try:
+        seconds = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a number of seconds: {value}")
+    if not seconds > 0:
+        raise argparse.ArgumentTypeError(f"must be more than 0 seconds: {value}")
+    return seconds
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m facload", description=__doc__.splitlines()[0])
+    parser.add_argument('-d', '--database', default=DATABASE_PATH, help=f"database file (default: {DATABASE_PATH})")
+    parser.add_argument('--timings', metavar='FILE', help="write per-operation timings to FILE as JSON")
+    commands = parser.add_subparsers(dest='command', required=True)
+    command = commands.add_parser('import', help="import faculty or course CSV feeds")
+    command.add_argument('files', nargs='+', metavar='FILE')
+    command.set_defaults(run=_import)
+    command = commands.add_parser('audit', help="list every schedule conflict in the database")
+    command.set_defaults(run=None)
+    command = commands.add_parser('report', help="print each faculty member's load, tab-separated")
+    command.add_argument('--summary', action='store_true', help="also total courses and units by year level and schedule")
+    command.set_defaults(run=_report)
+    command = commands.add_parser('export-csv', help="write the CSV export")
+    command.add_argument('file', metavar='FILE')
+    command.set_defaults(run=_export_csv)
+    command = commands.add_parser('export-pdf', help="write the PDF export")
+    command.add_argument('file', metavar='FILE')
+    command.set_defaults(run=_export_pdf)
+    command = commands.add_parser('assign', help="assign unassigned offerings with the solver")
+    command.add_argument('--time-limit', type=_positive_seconds, default=60.0, metavar='SECONDS')
+    command.set_defaults(run=_assign)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    start_logging()
+    # Only an import may create the database.
+    if args.command != 'import' and not os.path.exists(args.database):
+        print(f"Database not found: {args.database}", file=sys.stderr)
+        return EXIT_ERROR
+    logger.info(f"Command line: {args.command} on {args.database}")
+    status = _run(args)
+    if args.timings:
+        try:
+            TIMINGS.dump(args.timings, command=args.command)
+        except OSError as e:
+            print(f"Could not write timings: {e}", file=sys.stderr)
+            status = EXIT_ERROR
+    return status
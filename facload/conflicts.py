@@ -0,0 +1,185 @@
+"""Incremental schedule-conflict and occupancy indexes."""
+import functools
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from .models import YEAR_LEVELS, parse_schedule
+
+class ConflictIndex:
+    """Per-day occupancy of every faculty member and year level, kept as minute bitmasks.
+
+    Answers the check_schedule_conflict rules with a few dictionary lookups and
+    is updated incrementally as courses are added or removed.
+    """
+
+    def __init__(self, faculty_list=(), unassigned=()):
+        self.faculty_masks = {}
+        self.year_masks = {}
+        self.faculty_year_days = Counter()
+        # Slots behind each mask, so a removal can rebuild it exactly.
+        self._faculty_slots = defaultdict(Counter)
+        self._year_slots = defaultdict(Counter)
+        for faculty in faculty_list:
+            for course in faculty.courses:
+                self.add(faculty, course)
+        for course in unassigned:
+            self.add(None, course)
+
+    # A faculty of None stands for an unassigned offering, which only holds its
+    # year level's slot.
+    def conflicts(self, faculty, course):
+        return self.conflicts_slot(faculty, course.year_level, course.slot)
+
+    # For probing a slot without creating a Course for it.
+    def conflicts_slot(self, faculty, year_level, slot):
+        mask = slot.minute_mask
+        for day in slot.each_day():
+            if faculty is not None:
+                if self.faculty_year_days[(faculty, year_level, day)]:
+                    return True
+                if self.faculty_masks.get((faculty, day), 0) & mask:
+                    return True
+            if self.year_masks.get((year_level, day), 0) & mask:
+                return True
+        return False
+
+    def add(self, faculty, course):
+        slot = course.slot
+        mask = slot.minute_mask
+        for day in slot.each_day():
+            if faculty is not None:
+                self.faculty_year_days[(faculty, course.year_level, day)] += 1
+                self._reserve(self.faculty_masks, self._faculty_slots, (faculty, day), slot, mask)
+            self._reserve(self.year_masks, self._year_slots, (course.year_level, day), slot, mask)
+
+    def remove(self, faculty, course):
+        slot = course.slot
+        for day in slot.each_day():
+            if faculty is not None:
+                key = (faculty, course.year_level, day)
+                self.faculty_year_days[key] -= 1
+                if not self.faculty_year_days[key]:
+                    del self.faculty_year_days[key]
+                self._release(self.faculty_masks, self._faculty_slots, (faculty, day), slot)
+            self._release(self.year_masks, self._year_slots, (course.year_level, day), slot)
+
+    def _reserve(self, masks, slots, key, slot, mask):
+        masks[key] = masks.get(key, 0) | mask
+        slots[key][slot] += 1
+
+    def _release(self, masks, slots, key, slot):
+        remaining = slots[key]
+        remaining[slot] -= 1
+        if not remaining[slot]:
+            del remaining[slot]
+        mask = 0
+        for other in remaining:
+            mask |= other.minute_mask
+        if mask:
+            masks[key] = mask
+        else:
+            masks.pop(key, None)
+            del slots[key]
+
+WEEK_DAYS = 7
+BUCKET_MINUTES = 5
+BUCKETS_PER_DAY = 24 * 60 // BUCKET_MINUTES
+
+@functools.lru_cache(maxsize=None)
+def slot_buckets(slot):
+    # Week bucket indices covered by a slot; partial buckets count as occupied.
+    first = slot.start // BUCKET_MINUTES
+    last = -(-slot.end // BUCKET_MINUTES)
+    columns = [(day.bit_length() - 1) * BUCKETS_PER_DAY + bucket
+               for day in slot.each_day() for bucket in range(first, last)]
+    return np.array(columns, dtype=np.intp)
+
+class OccupancyMatrix:
+    """Faculty x week-bucket and year level x week-bucket course counts.
+
+    Rows are handed out as faculty and year levels appear and are recycled when
+    faculty are removed, so the arrays stay aligned with faculty_list without
+    being rebuilt. Each cell counts the courses meeting in that 5-minute bucket.
+    """
+
+    def __init__(self, faculty_list=(), unassigned=()):
+        self.faculty_rows = {}
+        self.year_rows = {}
+        self._free_rows = []
+        self.faculty = np.zeros((max(len(faculty_list), 16), WEEK_DAYS * BUCKETS_PER_DAY), dtype=np.uint16)
+        self.years = np.zeros((len(YEAR_LEVELS), WEEK_DAYS * BUCKETS_PER_DAY), dtype=np.uint16)
+        for year_level in YEAR_LEVELS:
+            self._year_row(year_level)
+        for faculty in faculty_list:
+            self.add_faculty(faculty)
+            for course in faculty.courses:
+                self.add(faculty, course)
+        for course in unassigned:
+            self.add(None, course)
+
+    def add_faculty(self, faculty):
+        if faculty in self.faculty_rows:
+            return
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            row = len(self.faculty_rows)
+            if row == len(self.faculty):
+                self.faculty = np.concatenate([self.faculty, np.zeros_like(self.faculty)])
+        self.faculty_rows[faculty] = row
+
+    def remove_faculty(self, faculty):
+        row = self.faculty_rows.pop(faculty, None)
+        if row is None:
+            return
+        for course in faculty.courses:
+            np.subtract.at(self.years[self.year_rows[course.year_level]], slot_buckets(course.slot), 1)
+        self.faculty[row] = 0
+        self._free_rows.append(row)
+
+    def _year_row(self, year_level):
+        row = self.year_rows.get(year_level)
+        if row is None:
+            row = self.year_rows[year_level] = len(self.year_rows)
+            if row == len(self.years):
+                self.years = np.concatenate([self.years, np.zeros((1, self.years.shape[1]), dtype=self.years.dtype)])
+        return row
+
+    # As in ConflictIndex, a faculty of None marks an unassigned offering.
+    def add(self, faculty, course):
+        columns = slot_buckets(course.slot)
+        if faculty is not None:
+            self.add_faculty(faculty)
+            np.add.at(self.faculty[self.faculty_rows[faculty]], columns, 1)
+        # _year_row may grow and replace self.years, so resolve the row first.
+        row = self._year_row(course.year_level)
+        np.add.at(self.years[row], columns, 1)
+
+    def remove(self, faculty, course):
+        columns = slot_buckets(course.slot)
+        if faculty is not None:
+            np.subtract.at(self.faculty[self.faculty_rows[faculty]], columns, 1)
+        np.subtract.at(self.years[self.year_rows[course.year_level]], columns, 1)
+
+    def free_faculty(self, schedule):
+        """Faculty with nothing scheduled during the given schedule text or TimeSlot."""
+        slot = parse_schedule(schedule) if isinstance(schedule, str) else schedule
+        faculty = list(self.faculty_rows)
+        rows = np.fromiter(self.faculty_rows.values(), dtype=np.intp, count=len(faculty))
+        busy = self.faculty[np.ix_(rows, slot_buckets(slot))].any(axis=1)
+        return [faculty[i] for i in np.flatnonzero(~busy)]
+
+    def year_level_free(self, year_level, schedule):
+        slot = parse_schedule(schedule) if isinstance(schedule, str) else schedule
+        row = self.year_rows.get(year_level)
+        return row is None or not self.years[row, slot_buckets(slot)].any()
+
+    def year_level_collisions(self):
+        """Year level -> number of 5-minute buckets in which two or more of its courses meet."""
+        counts = np.count_nonzero(self.years > 1, axis=1)
+        return {year_level: int(counts[row]) for year_level, row in self.year_rows.items() if counts[row]}
+
+    def faculty_collisions(self):
+        counts = np.count_nonzero(self.faculty > 1, axis=1)
+        return {faculty: int(counts[row]) for faculty, row in self.faculty_rows.items() if counts[row]}
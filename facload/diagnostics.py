@@ -0,0 +1,77 @@
+"""Debug log shared by the application and the headless tools.
+
+Modules log through logging.getLogger(__name__) under the "facload" logger.
+start_logging() attaches a QueueHandler to it, so a record costs a queue put
+on the calling thread and a QueueListener thread writes it to a rotating file.
+Until start_logging() is called, library use logs nowhere.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+
+LOG_PATH = os.path.join(os.path.expanduser('~'), 'faculty_app_debug.log')
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+logger = logging.getLogger('facload')
+logger.addHandler(logging.NullHandler())
+
+_listener = None
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    # Records never leave the process, so they are queued as they are instead
+    # of being formatted and copied first; the listener thread formats them.
+    def prepare(self, record):
+        return record
+
+def start_logging(path=None, level=None, max_bytes=1024 * 1024, backup_count=3, when=None):
+    """Send "facload" log records to a rotating file from a background thread.
+
+    The file rolls over at max_bytes, or on the `when` schedule of
+    TimedRotatingFileHandler (e.g. 'midnight') if given, keeping backup_count
+    old files. level is a level name or number, or OFF to disable logging, and
+    defaults to FACULTY_APP_LOG_LEVEL, then INFO; an unknown level falls back
+    to INFO with a warning. path defaults to FACULTY_APP_LOG, then LOG_PATH.
+    Explicit arguments win over the environment. Returns the listener, or None
+    when logging is off.
+    """
+    global _listener
+    stop_logging()
+    level = level if level is not None else os.environ.get('FACULTY_APP_LOG_LEVEL', 'INFO')
+    if str(level).upper() == 'OFF':
+        logger.setLevel(logging.CRITICAL + 1)
+        return None
+    unknown_level = None
+    try:
+        logger.setLevel(level.upper() if isinstance(level, str) else level)
+    except (TypeError, ValueError):
+        unknown_level = level
+        logger.setLevel(logging.INFO)
+    path = path or os.environ.get('FACULTY_APP_LOG') or LOG_PATH
+    if when:
+        handler = logging.handlers.TimedRotatingFileHandler(path, when=when, backupCount=backup_count, delay=True)
+    else:
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+    records = queue.SimpleQueue()
+    logger.addHandler(_LocalQueueHandler(records))
+    _listener = logging.handlers.QueueListener(records, handler)
+    _listener.start()
+    if unknown_level is not None:
+        logger.warning(f"Unknown log level {unknown_level!r}; logging at INFO instead.")
+    return _listener
+
+@atexit.register
+def stop_logging():
+    """Write out queued records and detach the file handler."""
+    global _listener
+    if _listener is None:
+        return
+    for handler in [handler for handler in logger.handlers if isinstance(handler, logging.handlers.QueueHandler)]:
+        logger.removeHandler(handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
@@ -0,0 +1,111 @@
+"""CSV and PDF exports of the faculty and course tables."""
+import csv
+import logging
+
+logger = logging.getLogger(__name__)
+
+def write_csv(file_path, faculty_list, unassigned=()):
+    with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["Faculty Information"])
+        writer.writerow(["Name", "Classification", "Admin", "Current Load", "Status"])
+        for faculty in faculty_list:
+            writer.writerow([
+                faculty.name,
+                faculty.classification,
+                "Yes" if faculty.is_admin else "No",
+                faculty.current_load(),
+                faculty.load_status()
+            ])
+        writer.writerow([])
+        writer.writerow(["Course Information"])
+        writer.writerow(["Faculty", "Course", "Year", "Units", "Schedule"])
+        for faculty in faculty_list:
+            for course in faculty.courses:
+                writer.writerow([
+                    faculty.name,
+                    course.name,
+                    course.year_level,
+                    course.units,
+                    course.schedule
+                ])
+        # A blank faculty keeps offerings unassigned when the file is imported again.
+        for course in unassigned:
+            writer.writerow(["", course.name, course.year_level, course.units, course.schedule])
+
+def write_pdf(file_path, faculty_list, unassigned=()):
+    # reportlab takes longer to import than the rest of the package; only PDF exports pay for it.
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Spacer
+
+    doc = SimpleDocTemplate(file_path, pagesize=letter)
+    elements = []
+
+    # Faculty Table
+    logger.debug("Creating faculty table...")
+    faculty_data = [["Name", "Classification", "Admin", "Current Load", "Status"]]
+    for faculty in faculty_list:
+        faculty_data.append([
+            faculty.name,
+            faculty.classification,
+            "Yes" if faculty.is_admin else "No",
+            str(faculty.current_load()),
+            faculty.load_status()
+        ])
+    faculty_table = Table(faculty_data)
+    faculty_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 12),
+        ('TOPPADDING', (0, 1), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    elements.append(faculty_table)
+    logger.debug("Adding Spacer...")
+    elements.append(Spacer(1, 20))
+
+    # Course Table
+    logger.debug("Creating course table...")
+    course_data = [["Faculty", "Course", "Year", "Units", "Schedule"]]
+    for faculty in faculty_list:
+        for course in faculty.courses:
+            course_data.append([
+                faculty.name,
+                course.name,
+                course.year_level,
+                str(course.units),
+                course.schedule
+            ])
+    for course in unassigned:
+        course_data.append(["Unassigned", course.name, course.year_level, str(course.units), course.schedule])
+    course_table = Table(course_data)
+    course_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 12),
+        ('TOPPADDING', (0, 1), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    elements.append(course_table)
+
+    logger.debug("Building PDF...")
+    doc.build(elements)
@@ -0,0 +1,157 @@
+"""Bulk CSV import of faculty and course feeds."""
+import csv
+from collections import namedtuple
+
+from .conflicts import ConflictIndex
+from .models import CLASSIFICATIONS, SCHEDULES, UNITS, YEAR_LEVELS, Course, Faculty, normalize_name, parse_schedule
+
+ImportIssue = namedtuple('ImportIssue', ['line', 'message'])
+
+# Title rows write_csv puts above each section of an export.
+EXPORT_SECTIONS = ("Faculty Information", "Course Information")
+
+class ImportResult:
+    def __init__(self):
+        self.faculty = []
+        self.courses = []  # (faculty, course) pairs; faculty is None for offerings
+        self.issues = []
+
+class BulkImporter:
+    """Validates registrar CSV feeds against the current roster and writes them in bulk.
+
+    Faculty feeds have Name, Classification and Admin columns. Course feeds use
+    the Faculty, Course, Year, Units and Schedule columns of the CSV export; if
+    they also carry Classification (and optionally Admin), unknown faculty are
+    created on the fly. A blank Faculty makes the row an unassigned offering.
+    A CSV export itself can be imported: its faculty section is read first,
+    then its course section. Rejected rows are reported by line number.
+    Accepted courses are created in store (COURSE_STORE if not given).
+    """
+
+    def __init__(self, faculty_list, unassigned=(), store=None):
+        self.store = store
+        self.faculty_by_key = {normalize_name(faculty.name): faculty for faculty in faculty_list}
+        # A private index, so rows accepted here only reach the application's
+        # index once they have been written.
+        self.conflict_index = ConflictIndex(faculty_list, unassigned)
+
+    def read(self, path):
+        result = ImportResult()
+        # utf-8-sig drops the byte order mark Excel writes, which would
+        # otherwise become part of the first column name.
+        with open(path, newline='', encoding='utf-8-sig') as csvfile:
+            reader = csv.reader(csvfile)
+            fields = next(reader, None)
+            while fields is not None:
+                if not any(fields) or (len(fields) == 1 and fields[0] in EXPORT_SECTIONS):
+                    fields = next(reader, None)
+                    continue
+                parse_row, message = self._row_parser(fields)
+                if message:
+                    result.issues.append(ImportIssue(reader.line_num, message))
+                    return result
+                fields = self._read_section(reader, fields, parse_row, result)
+        return result
+
+    def _row_parser(self, fields):
+        if "Course" in fields:
+            if "Faculty" not in fields:
+                return None, "A course feed needs a Faculty column (leave it blank for offerings)."
+            return self._read_course_row, None
+        if "Name" in fields:
+            return self._read_faculty_row, None
+        return None, "Header must contain either a Course or a Name column."
+
+    def _read_section(self, reader, fields, parse_row, result):
+        # Reads rows until the file ends or an export's next section title,
+        # which is returned so read() can carry on from there.
+        for values in reader:
+            if not any(values):
+                continue
+            if len(values) == 1 and values[0] in EXPORT_SECTIONS:
+                return values
+            row = {field: values[i] if i < len(values) else None for i, field in enumerate(fields)}
+            message = parse_row(row, result)
+            if message:
+                result.issues.append(ImportIssue(reader.line_num, message))
+        return None
+
+    def _new_faculty(self, name, row, result):
+        classification = (row.get("Classification") or "").strip()
+        if classification not in CLASSIFICATIONS:
+            return None, f"Unknown classification '{classification}'."
+        is_admin = (row.get("Admin") or "").strip().lower() in ("yes", "admin", "true", "1")
+        faculty = Faculty(name, classification, is_admin)
+        self.faculty_by_key[normalize_name(name)] = faculty
+        result.faculty.append(faculty)
+        return faculty, None
+
+    def _read_faculty_row(self, row, result):
+        name = (row.get("Name") or "").strip()
+        if not name:
+            return "Missing faculty name."
+        if normalize_name(name) in self.faculty_by_key:
+            return f"Faculty '{name}' already exists."
+        return self._new_faculty(name, row, result)[1]
+
+    def _read_course_row(self, row, result):
+        name = (row.get("Course") or "").strip()
+        faculty_name = (row.get("Faculty") or "").strip()
+        year_level = (row.get("Year") or "").strip()
+        schedule = (row.get("Schedule") or "").strip()
+        if not name:
+            return "Missing course name."
+        if year_level not in YEAR_LEVELS:
+            return f"Unknown year level '{year_level}'."
+        try:
+            units = int(row.get("Units") or "")
+        except ValueError:
+            units = None
+        if units not in UNITS:
+            return f"Units must be one of {', '.join(str(u) for u in UNITS)}."
+        if schedule not in SCHEDULES:
+            return f"Unknown schedule '{schedule}'."
+        faculty = self.faculty_by_key.get(normalize_name(faculty_name))
+        if faculty is None and faculty_name and "Classification" not in row:
+            return f"Faculty '{faculty_name}' not found."
+        # A faculty member this row would create has no courses yet, so checking
+        # as an offering (faculty None) applies the year-level rules they face.
+        if self.conflict_index.conflicts_slot(faculty, year_level, parse_schedule(schedule)):
+            return f"'{name}' conflicts with an existing schedule for {faculty_name or 'an offering'} or {year_level}."
+        if faculty is None and faculty_name:
+            faculty, message = self._new_faculty(faculty_name, row, result)
+            if message:
+                return message
+        course = Course(name, year_level, units, schedule, store=self.store)
+        self.conflict_index.add(faculty, course)
+        result.courses.append((faculty, course))
+        return None
+
+    def write(self, connection, result):
+        # Ids are handed out here rather than read back row by row, which keeps
+        # every insert in a single executemany call.
+        cursor = connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            next_faculty_id = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM faculty").fetchone()[0] + 1
+            next_course_id = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM courses").fetchone()[0] + 1
+            for offset, faculty in enumerate(result.faculty):
+                faculty.id = next_faculty_id + offset
+            for offset, (_, course) in enumerate(result.courses):
+                course.id = next_course_id + offset
+            cursor.executemany('''
+                INSERT INTO faculty (id, name, classification, is_admin)
+                VALUES (?, ?, ?, ?)
+            ''', [(f.id, f.name, f.classification, f.is_admin) for f in result.faculty])
+            cursor.executemany('''
+                INSERT INTO courses (id, faculty_id, name, year_level, units, schedule, days, start_minute, end_minute)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(c.id, f.id if f else None, c.name, c.year_level, c.units, c.schedule, *c.slot) for f, c in result.courses])
+        except Exception:
+            connection.rollback()
+            for faculty in result.faculty:
+                faculty.id = None
+            for _, course in result.courses:
+                course.id = None
+            raise
+        connection.commit()
@@ -0,0 +1,372 @@
+"""Courses, faculty and the schedule vocabulary they are built from."""
+import functools
+import logging
+import sys
+import threading
+import weakref
+from array import array
+from collections import namedtuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CLASSIFICATIONS = ["Full-time PhD", "Full-time MA", "Part-time"]
+YEAR_LEVELS = ["BA 1", "BA 2", "BA 3", "BA 4", "MA 1", "MA 2"]
+UNITS = [3, 6]
+SCHEDULES = [
+    "MW 07:40am-09:10am", "MW 09:20am-10:50am", "MW 12:25pm-01:55pm", "MW 02:05pm-03:35pm",
+    "TTh 07:40am-09:10am", "TTh 09:20am-10:50am", "TTh 12:25pm-01:55pm", "TTh 02:05pm-03:35pm",
+    "TTh 03:45pm-05:15pm", "TTh 05:50pm-07:20pm", "TTh 07:30pm-09:00pm",
+    "Sat 09:00am-12:00pm", "Sat 01:00pm-04:00pm", "Sat 05:00pm-08:00pm"
+]
+
+# Longer tokens first so that "TTh" splits into T + Th rather than T + T + h.
+DAY_BITS = [("Sat", 1 << 5), ("Sun", 1 << 6), ("Th", 1 << 3), ("Su", 1 << 6), ("M", 1 << 0), ("T", 1 << 1), ("W", 1 << 2), ("F", 1 << 4), ("S", 1 << 5)]
+
+class TimeSlot(namedtuple('TimeSlot', ['days', 'start', 'end'])):
+    """A weekly meeting pattern: a bitmask of days plus start/end minutes after midnight."""
+    __slots__ = ()
+
+    def overlaps(self, other):
+        return bool(self.days & other.days) and self.start < other.end and other.start < self.end
+
+    @property
+    def minute_mask(self):
+        # One bit per minute of the day, so overlap tests are a single AND.
+        return ((1 << (self.end - self.start)) - 1) << self.start
+
+    def each_day(self):
+        days = self.days
+        while days:
+            day = days & -days
+            yield day
+            days ^= day
+
+# Schedules that cannot be parsed meet on no day, so they never conflict.
+UNSCHEDULED = TimeSlot(0, 0, 0)
+
+def _parse_clock(text):
+    hours, minutes = text[:-2].split(':')
+    hours, minutes = int(hours), int(minutes)
+    meridiem = text[-2:].lower()
+    if meridiem not in ("am", "pm") or not 1 <= hours <= 12 or not 0 <= minutes < 60:
+        raise ValueError(text)
+    return (hours % 12 + (12 if meridiem == "pm" else 0)) * 60 + minutes
+
+@functools.lru_cache(maxsize=None)
+def parse_schedule(schedule):
+    """Parse text like "MW 07:40am-09:10am"; memoized, so each distinct string is parsed once."""
+    try:
+        day_text, times = schedule.split()
+        days = 0
+        while day_text:
+            for token, bit in DAY_BITS:
+                if day_text.startswith(token):
+                    days |= bit
+                    day_text = day_text[len(token):]
+                    break
+            else:
+                raise ValueError(day_text)
+        start_text, end_text = times.split('-')
+        start, end = _parse_clock(start_text), _parse_clock(end_text)
+        if not days or start >= end:
+            raise ValueError(times)
+    except ValueError:
+        logger.warning(f"Unrecognised schedule: {schedule!r}")
+        return UNSCHEDULED
+    return TimeSlot(days, start, end)
+
+class CourseStore:
+    """Course attributes held column-wise, one row per live Course.
+
+    Year levels and schedules are coded through small string tables, and faculty
+    through rows recycled once they have no courses left, so whole-term totals
+    are NumPy reductions over the columns instead of loops over faculty_list.
+    Faculty are held weakly and rows of garbage-collected courses go on a free
+    list, so a store outlives any one roster without keeping it alive.
+    """
+
+    def __init__(self):
+        self.ids = array('q')  # -1 until the course is saved
+        self.faculty = array('i')  # faculty row, or -1 while unassigned
+        self.year_levels = array('i')
+        self.units = array('b')
+        self.schedules = array('i')
+        self.live = array('b')
+        self.names = []
+        self.year_level_table = []
+        self.year_level_codes = {}
+        self.schedule_table = []
+        self.schedule_codes = {}
+        self.slot_table = []
+        self.faculty_table = []  # weak references, None for free rows
+        self.faculty_rows = weakref.WeakKeyDictionary()
+        self._faculty_courses = []
+        self._free_faculty_rows = []
+        self._free_rows = []
+        # Rows are released from Course.__del__, which may run on the writer
+        # thread or in the middle of another store call.
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.live) - len(self._free_rows)
+
+    def _code(self, table, codes, value):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(table)
+            table.append(value)
+            if table is self.schedule_table:
+                self.slot_table.append(parse_schedule(value))
+        return code
+
+    def year_level_code(self, year_level):
+        return self._code(self.year_level_table, self.year_level_codes, year_level)
+
+    def schedule_code(self, schedule):
+        return self._code(self.schedule_table, self.schedule_codes, schedule)
+
+    def allocate(self, id, name, year_level, units, schedule):
+        year_code = self.year_level_code(year_level)
+        schedule_code = self.schedule_code(schedule)
+        with self._lock:
+            if self._free_rows:
+                row = self._free_rows.pop()
+                self.ids[row] = -1 if id is None else id
+                self.faculty[row] = -1
+                self.year_levels[row] = year_code
+                self.units[row] = units
+                self.schedules[row] = schedule_code
+                self.live[row] = 1
+                self.names[row] = name
+            else:
+                row = len(self.live)
+                self.ids.append(-1 if id is None else id)
+                self.faculty.append(-1)
+                self.year_levels.append(year_code)
+                self.units.append(units)
+                self.schedules.append(schedule_code)
+                self.live.append(1)
+                self.names.append(name)
+        return row
+
+    def discard(self, row):
+        with self._lock:
+            self._set_faculty(row, None)
+            self.live[row] = 0
+
+    def release(self, row):
+        with self._lock:
+            self.discard(row)
+            self.names[row] = None
+            self._free_rows.append(row)
+
+    def get_faculty(self, row):
+        code = self.faculty[row]
+        return None if code < 0 else self.faculty_table[code]()
+
+    def set_faculty(self, row, faculty):
+        with self._lock:
+            self._set_faculty(row, faculty)
+
+    def _set_faculty(self, row, faculty):
+        old = self.faculty[row]
+        if old >= 0:
+            self._faculty_courses[old] -= 1
+            if not self._faculty_courses[old]:
+                previous = self.faculty_table[old]()
+                if previous is not None:
+                    del self.faculty_rows[previous]
+                self.faculty_table[old] = None
+                self._free_faculty_rows.append(old)
+        if faculty is None:
+            self.faculty[row] = -1
+            return
+        code = self.faculty_rows.get(faculty)
+        if code is None:
+            if self._free_faculty_rows:
+                code = self._free_faculty_rows.pop()
+                self.faculty_table[code] = weakref.ref(faculty)
+                self._faculty_courses[code] = 0
+            else:
+                code = len(self.faculty_table)
+                self.faculty_table.append(weakref.ref(faculty))
+                self._faculty_courses.append(0)
+            self.faculty_rows[faculty] = code
+        self._faculty_courses[code] += 1
+        self.faculty[row] = code
+
+    def _column(self, column, dtype):
+        # A copy rather than np.frombuffer: a live buffer export would stop the
+        # array from growing if another thread allocated a course meanwhile.
+        return np.array(column, dtype=dtype)
+
+    def faculty_loads(self, faculty_list):
+        """Assigned units for each faculty in faculty_list, as an array in the same order."""
+        with self._lock:
+            codes = self._column(self.faculty, np.int32)
+            assigned = codes >= 0
+            totals = np.bincount(codes[assigned], weights=self._column(self.units, np.int8)[assigned],
+                                 minlength=len(self.faculty_table))
+        rows = np.fromiter((self.faculty_rows.get(faculty, -1) for faculty in faculty_list), dtype=np.intp, count=len(faculty_list))
+        loads = np.where(rows >= 0, totals[rows], 0)
+        return loads.astype(np.int64)
+
+    def _totals(self, codes, table, weights=None):
+        with self._lock:
+            live = self._column(self.live, np.int8).astype(bool)
+            codes = self._column(codes, np.int32)[live]
+            if weights is not None:
+                weights = self._column(weights, np.int8)[live]
+            totals = np.bincount(codes, weights=weights, minlength=len(table))
+        return {table[code]: int(totals[code]) for code in np.flatnonzero(totals)}
+
+    def year_level_units(self):
+        """Year level -> total units offered, assigned or not."""
+        return self._totals(self.year_levels, self.year_level_table, self.units)
+
+    def year_level_counts(self):
+        return self._totals(self.year_levels, self.year_level_table)
+
+    def schedule_counts(self):
+        """Schedule text -> number of courses meeting in that slot."""
+        return self._totals(self.schedules, self.schedule_table)
+
+    def unassigned_units(self):
+        with self._lock:
+            live = self._column(self.live, np.int8).astype(bool)
+            unassigned = live & (self._column(self.faculty, np.int32) < 0)
+            return int(self._column(self.units, np.int8)[unassigned].sum(dtype=np.int64))
+
+COURSE_STORE = CourseStore()
+
+# A Course is a handle on a row of a CourseStore (COURSE_STORE unless given);
+# its attributes read and write the store's columns.
+class Course:
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, name, year_level, units, schedule, id=None, store=None):
+        self._store = COURSE_STORE if store is None else store
+        self._row = self._store.allocate(id, name, year_level, units, schedule)
+
+    def __del__(self):
+        self._store.release(self._row)
+
+    @property
+    def store(self):
+        return self._store
+
+    @property
+    def id(self):
+        id = self._store.ids[self._row]
+        return None if id < 0 else id
+
+    @id.setter
+    def id(self, id):
+        self._store.ids[self._row] = -1 if id is None else id
+
+    # Set by Faculty.add_course; None while unassigned.
+    @property
+    def faculty(self):
+        return self._store.get_faculty(self._row)
+
+    @faculty.setter
+    def faculty(self, faculty):
+        self._store.set_faculty(self._row, faculty)
+
+    @property
+    def name(self):
+        return self._store.names[self._row]
+
+    @name.setter
+    def name(self, name):
+        self._store.names[self._row] = name
+
+    @property
+    def year_level(self):
+        return self._store.year_level_table[self._store.year_levels[self._row]]
+
+    @year_level.setter
+    def year_level(self, year_level):
+        self._store.year_levels[self._row] = self._store.year_level_code(year_level)
+
+    @property
+    def units(self):
+        return self._store.units[self._row]
+
+    @units.setter
+    def units(self, units):
+        self._store.units[self._row] = units
+
+    @property
+    def schedule(self):
+        return self._store.schedule_table[self._store.schedules[self._row]]
+
+    @schedule.setter
+    def schedule(self, schedule):
+        self._store.schedules[self._row] = self._store.schedule_code(schedule)
+
+    @property
+    def slot(self):
+        return self._store.slot_table[self._store.schedules[self._row]]
+
+def normalize_name(name):
+    # Key for name lookups: case-insensitive, ignoring surrounding and repeated whitespace.
+    return " ".join(name.split()).casefold()
+
+# Faculty are slotted and their classification interned, so a large roster
+# holds one copy of each classification string.
+class Faculty:
+    __slots__ = ('id', 'name', 'classification', 'is_admin', 'courses', 'required_load', '_current_load', '_load_status', '__weakref__')
+
+    def __init__(self, name, classification, is_admin=False, id=None):
+        self.id = id
+        self.name = name
+        self.classification = sys.intern(classification)
+        self.is_admin = is_admin
+        self.courses = []
+        self.required_load = self.calculate_required_load()
+        # Running total of course units and the cached load_status text; kept
+        # current by add_course/remove_course, see invalidate_load for other edits.
+        self._current_load = 0
+        self._load_status = None
+
+    def add_course(self, course):
+        course.faculty = self
+        self.courses.append(course)
+        self._current_load += course.units
+        self._load_status = None
+
+    def remove_course(self, course):
+        self.courses.remove(course)
+        course.faculty = None
+        self._current_load -= course.units
+        self._load_status = None
+
+    def invalidate_load(self):
+        # Call after changing a course's units or editing self.courses directly.
+        self._current_load = sum(course.units for course in self.courses)
+        self._load_status = None
+
+    def calculate_required_load(self):
+        if self.classification == "Full-time PhD":
+            return 15 - (12 if self.is_admin else 0)
+        elif self.classification == "Full-time MA":
+            return 18 - (12 if self.is_admin else 0)
+        else:  # Part-time
+            return 0
+
+    def current_load(self):
+        return self._current_load
+
+    def load_status(self):
+        if self._load_status is None:
+            current = self._current_load
+            if current < self.required_load:
+                self._load_status = f"Below required ({self.required_load - current} units short)"
+            elif current > self.required_load:
+                self._load_status = f"Overload ({current - self.required_load} units excess)"
+            else:
+                self._load_status = "Satisfied"
+        return self._load_status
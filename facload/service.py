@@ -0,0 +1,239 @@
+"""The roster, its conflict indexes and persistence, independent of any GUI."""
+import logging
+import os
+import sqlite3
+from collections import namedtuple
+
+from .audit import audit_conflicts
+from .conflicts import ConflictIndex, OccupancyMatrix
+from .exports import write_csv, write_pdf
+from .importer import BulkImporter
+from .models import SCHEDULES, Course, CourseStore, Faculty, normalize_name, parse_schedule
+from .solver import PARALLEL_SOLVER_THRESHOLD, AssignmentProblem, solve_assignment, solve_assignment_parallel
+from .storage import DATABASE_PATH, DatabaseWriter, UnitOfWork, connect_database, migrate_database, refresh_time_slots
+from .timing import timed
+
+logger = logging.getLogger(__name__)
+
+Alternative = namedtuple('Alternative', ['label', 'faculty', 'schedule'])
+CourseTotals = namedtuple('CourseTotals', ['year_level_units', 'year_level_counts', 'schedule_counts', 'unassigned_units'])
+
+class WorkloadService:
+    """Loads a faculty workload database and applies edits to it.
+
+    Every edit keeps the conflict indexes current and is queued on the
+    background writer; close() waits for the writer and reports whether
+    everything was saved. The roster's courses live in the service's own
+    course_store, so its totals cover this roster and nothing else.
+    FacultyWorkloadApp is a view over one of these, and scripts can use it
+    directly without importing Qt. pragmas overrides entries of SQLITE_PRAGMAS
+    on both the service's connection and the writer's.
+    """
+
+    def __init__(self, database_path=DATABASE_PATH, on_committed=None, on_failed=None, pragmas=None):
+        self.database_path = database_path
+        self.pragmas = pragmas
+        self.course_store = CourseStore()
+        self.faculty_list = []
+        self.unassigned_courses = []
+        self.unit_of_work = UnitOfWork()
+        logger.debug("Connecting to database...")
+        self.connection = connect_database(database_path, pragmas)
+        logger.debug("Creating tables...")
+        migrate_database(self.connection)
+        logger.debug("Loading data from database...")
+        self.load()
+        self.writer = DatabaseWriter(database_path, pragmas, on_committed=on_committed, on_failed=on_failed)
+
+    @timed('load')
+    def load(self):
+        # One ordered join instead of a courses query per faculty; rows arrive
+        # grouped by faculty so they can be folded in a single pass.
+        self.faculty_list = []
+        self.unassigned_courses = []
+        refresh_time_slots(self.connection)
+        cursor = self.connection.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute('''
+            SELECT f.id AS faculty_id, f.name AS faculty_name, f.classification, f.is_admin,
+                   c.id AS course_id, c.name AS course_name, c.year_level, c.units, c.schedule
+            FROM faculty f
+            LEFT JOIN courses c ON c.faculty_id = f.id
+            ORDER BY f.id, c.id
+        ''')
+        faculty = None
+        for row in cursor:
+            if faculty is None or faculty.id != row['faculty_id']:
+                faculty = Faculty(row['faculty_name'], row['classification'], bool(row['is_admin']), id=row['faculty_id'])
+                self.faculty_list.append(faculty)
+            if row['course_id'] is not None:
+                faculty.add_course(Course(row['course_name'], row['year_level'], row['units'], row['schedule'],
+                                          id=row['course_id'], store=self.course_store))
+        # Offerings without a (surviving) faculty row wait for assignment.
+        cursor.execute('''
+            SELECT c.id, c.name, c.year_level, c.units, c.schedule
+            FROM courses c
+            LEFT JOIN faculty f ON f.id = c.faculty_id
+            WHERE f.id IS NULL
+            ORDER BY c.id
+        ''')
+        for row in cursor:
+            self.unassigned_courses.append(Course(row['name'], row['year_level'], row['units'], row['schedule'],
+                                                 id=row['id'], store=self.course_store))
+        self.index_faculty_names()
+        self.conflict_index = ConflictIndex(self.faculty_list, self.unassigned_courses)
+        self.occupancy = OccupancyMatrix(self.faculty_list, self.unassigned_courses)
+
+    def save(self):
+        if self.unit_of_work.has_changes():
+            self.writer.submit(self.unit_of_work.take())
+
+    @timed('flush')
+    def flush(self):
+        self.save()
+        return self.writer.flush()
+
+    def close(self):
+        self.save()
+        durable = self.writer.close()
+        if not durable:
+            logger.error("Some changes could not be saved before closing.")
+        self.connection.close()
+        return durable
+
+    def index_faculty_names(self):
+        self.faculty_by_key = {}
+        for faculty in self.faculty_list:
+            if self.faculty_by_key.setdefault(normalize_name(faculty.name), faculty) is not faculty:
+                logger.warning(f"Faculty name differs from another only by case or spacing: {faculty.name!r}")
+
+    def find_faculty(self, name):
+        return self.faculty_by_key.get(normalize_name(name))
+
+    def add_faculty(self, name, classification, is_admin=False):
+        name = name.strip()
+        if not name:
+            raise ValueError("Please enter a faculty name.")
+        if self.find_faculty(name):
+            raise ValueError("A faculty member with this name already exists.")
+        faculty = Faculty(name, classification, is_admin)
+        self.faculty_list.append(faculty)
+        self.faculty_by_key[normalize_name(name)] = faculty
+        self.occupancy.add_faculty(faculty)
+        self.unit_of_work.register_new(faculty)
+        self.save()
+        return faculty
+
+    @timed('conflict_check')
+    def check_schedule_conflict(self, faculty, new_course):
+        return self.conflict_index.conflicts(faculty, new_course)
+
+    def assign_course(self, faculty, course):
+        """Give course to faculty and return the roster's copy of it.
+
+        A course from another store, such as one built to probe for conflicts,
+        is copied into course_store first.
+        """
+        if course.store is not self.course_store:
+            course = Course(course.name, course.year_level, course.units, course.schedule, id=course.id, store=self.course_store)
+        faculty.add_course(course)
+        self.conflict_index.add(faculty, course)
+        self.occupancy.add(faculty, course)
+        self.unit_of_work.register_new(course, faculty)
+        self.save()
+        return course
+
+    def suggest_alternatives(self, faculty, course, limit=10):
+        # Other slots for the same faculty member, nearest to the requested time
+        # first, then faculty who are free in the requested slot, neediest first.
+        requested = course.slot
+        slots = []
+        for schedule in SCHEDULES:
+            slot = parse_schedule(schedule)
+            if schedule != course.schedule and not self.conflict_index.conflicts_slot(faculty, course.year_level, slot):
+                slots.append(((slot.days != requested.days, abs(slot.start - requested.start)), schedule))
+        slots.sort()
+        alternatives = [Alternative(f"Move to {schedule} with {faculty.name}", faculty, schedule)
+                        for _, schedule in slots[:limit]]
+        if self.occupancy.year_level_free(course.year_level, requested):
+            free = [other for other in self.occupancy.free_faculty(requested)
+                    if other is not faculty and not self.conflict_index.conflicts(other, course)]
+            free.sort(key=lambda other: other.current_load() - other.required_load)
+            alternatives.extend(
+                Alternative(f"Keep {course.schedule} with {other.name} ({other.load_status()})", other, course.schedule)
+                for other in free[:limit]
+            )
+        return alternatives
+
+    @timed('import')
+    def import_csv(self, file_path):
+        logger.info(f"Importing CSV from: {file_path}")
+        # The writer must be idle so the bulk insert sees the current max ids.
+        self.flush()
+        importer = BulkImporter(self.faculty_list, self.unassigned_courses, store=self.course_store)
+        result = importer.read(file_path)
+        importer.write(self.connection, result)
+        self.faculty_list.extend(result.faculty)
+        for faculty in result.faculty:
+            self.faculty_by_key[normalize_name(faculty.name)] = faculty
+            self.occupancy.add_faculty(faculty)
+        for faculty, course in result.courses:
+            if faculty is None:
+                self.unassigned_courses.append(course)
+            else:
+                faculty.add_course(course)
+            self.conflict_index.add(faculty, course)
+            self.occupancy.add(faculty, course)
+        logger.info(f"CSV import added {len(result.faculty)} faculty and {len(result.courses)} courses, rejected {len(result.issues)} rows.")
+        return result
+
+    @timed('auto_assign')
+    def auto_assign(self, time_limit=60.0):
+        """Place unassigned offerings with the solver; returns the Assignment, or None if there were none."""
+        offerings = self.unassigned_courses
+        if not offerings:
+            return None
+        logger.info(f"Auto-assigning {len(offerings)} offerings...")
+        problem = AssignmentProblem(self.faculty_list, offerings)
+        if len(offerings) >= PARALLEL_SOLVER_THRESHOLD and (os.cpu_count() or 1) > 1:
+            solution = solve_assignment_parallel(problem, time_limit=time_limit)
+        else:
+            solution = solve_assignment(problem, time_limit=time_limit)
+        remaining = []
+        for course, index in zip(offerings, solution.faculty_of):
+            if index < 0:
+                remaining.append(course)
+                continue
+            faculty = self.faculty_list[index]
+            self.conflict_index.remove(None, course)
+            self.conflict_index.add(faculty, course)
+            self.occupancy.remove(None, course)
+            self.occupancy.add(faculty, course)
+            faculty.add_course(course)
+            self.unit_of_work.register_dirty(course, faculty)
+        self.unassigned_courses = remaining
+        self.save()
+        logger.info(f"Auto-assign placed {len(offerings) - len(remaining)} offerings; shortfall {solution.shortfall}, overload {solution.overload}.")
+        return solution
+
+    @timed('audit')
+    def audit(self):
+        logger.debug("Starting conflict audit...")
+        self.flush()
+        conflicts = audit_conflicts(self.connection)
+        logger.info(f"Conflict audit found {len(conflicts)} conflicts.")
+        return conflicts
+
+    def course_totals(self):
+        """Courses and units by year level and schedule, over this roster only."""
+        store = self.course_store
+        return CourseTotals(store.year_level_units(), store.year_level_counts(), store.schedule_counts(),
+                            store.unassigned_units())
+
+    @timed('export.csv')
+    def write_csv(self, file_path):
+        write_csv(file_path, self.faculty_list, self.unassigned_courses)
+
+    @timed('export.pdf')
+    def write_pdf(self, file_path):
+        write_pdf(file_path, self.faculty_list, self.unassigned_courses)
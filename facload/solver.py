@@ -0,0 +1,234 @@
+"""Assignment of unassigned offerings to faculty."""
+import os
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from .conflicts import WEEK_DAYS
+
+def _day_indexes(slot):
+    return tuple(day.bit_length() - 1 for day in slot.each_day())
+
+class AssignmentProblem:
+    """Plain-data snapshot of faculty loads and unassigned sections for the solver.
+
+    Only ints, lists and tuples are kept (faculty and sections are referred to by
+    position), so a problem pickles cheaply and solutions map back by index.
+    """
+
+    def __init__(self, faculty_list, offerings):
+        year_codes = {}
+        self.required = [faculty.required_load for faculty in faculty_list]
+        self.load = [faculty.current_load() for faculty in faculty_list]
+        # Per faculty and weekday: a minute mask of busy time and a bit per year level taught.
+        self.busy = [[0] * WEEK_DAYS for _ in faculty_list]
+        self.year_days = [[0] * WEEK_DAYS for _ in faculty_list]
+        self.year_busy = {}
+        for index, faculty in enumerate(faculty_list):
+            for course in faculty.courses:
+                slot = course.slot
+                year = year_codes.setdefault(course.year_level, len(year_codes))
+                for day in _day_indexes(slot):
+                    self.busy[index][day] |= slot.minute_mask
+                    self.year_days[index][day] |= 1 << year
+                    self.year_busy[(year, day)] = self.year_busy.get((year, day), 0) | slot.minute_mask
+        self.sections = []
+        for course in offerings:
+            slot = course.slot
+            year = year_codes.setdefault(course.year_level, len(year_codes))
+            self.sections.append((year, course.units, _day_indexes(slot), slot.minute_mask))
+
+class Assignment:
+    def __init__(self, faculty_of, shortfall, overload):
+        self.faculty_of = faculty_of  # faculty index per section, -1 when unplaced
+        self.unplaced = faculty_of.count(-1)
+        self.shortfall = shortfall
+        self.overload = overload
+
+    def score(self):
+        # Lower is better: staff every section first, then get loads as close to required as possible.
+        return (self.unplaced, self.shortfall + self.overload, self.overload)
+
+class _AssignmentState:
+    def __init__(self, problem):
+        self.problem = problem
+        self.load = list(problem.load)
+        self.busy = [list(days) for days in problem.busy]
+        self.year_days = [list(days) for days in problem.year_days]
+        self.year_busy = dict(problem.year_busy)
+        self.faculty_of = [-1] * len(problem.sections)
+        # Faculty bucketed by remaining need (required minus current load).
+        self.by_need = defaultdict(set)
+        for index, required in enumerate(problem.required):
+            self.by_need[required - self.load[index]].add(index)
+
+    def need(self, faculty):
+        return self.problem.required[faculty] - self.load[faculty]
+
+    def year_fits(self, section):
+        year, _, days, mask = self.problem.sections[section]
+        return not any(self.year_busy.get((year, day), 0) & mask for day in days)
+
+    def fits(self, faculty, section):
+        year, _, days, mask = self.problem.sections[section]
+        busy = self.busy[faculty]
+        year_days = self.year_days[faculty]
+        bit = 1 << year
+        for day in days:
+            if busy[day] & mask or year_days[day] & bit:
+                return False
+        return True
+
+    def _move_bucket(self, faculty, old_need):
+        bucket = self.by_need[old_need]
+        bucket.discard(faculty)
+        if not bucket:
+            del self.by_need[old_need]
+        self.by_need[self.need(faculty)].add(faculty)
+
+    # Placed sections never overlap anything they share a mask with, so
+    # clearing their bits on removal is exact.
+    def place(self, faculty, section):
+        year, units, days, mask = self.problem.sections[section]
+        old_need = self.need(faculty)
+        for day in days:
+            self.busy[faculty][day] |= mask
+            self.year_days[faculty][day] |= 1 << year
+            self.year_busy[(year, day)] = self.year_busy.get((year, day), 0) | mask
+        self.load[faculty] += units
+        self.faculty_of[section] = faculty
+        self._move_bucket(faculty, old_need)
+
+    def unplace(self, section):
+        faculty = self.faculty_of[section]
+        year, units, days, mask = self.problem.sections[section]
+        old_need = self.need(faculty)
+        for day in days:
+            self.busy[faculty][day] &= ~mask
+            self.year_days[faculty][day] &= ~(1 << year)
+            self.year_busy[(year, day)] &= ~mask
+        self.load[faculty] -= units
+        self.faculty_of[section] = -1
+        self._move_bucket(faculty, old_need)
+
+    def neediest_fit(self, section, exclude=None):
+        for need in sorted(self.by_need, reverse=True):
+            for faculty in self.by_need[need]:
+                if faculty != exclude and self.fits(faculty, section):
+                    return faculty
+        return None
+
+    def result(self):
+        shortfall = overload = 0
+        for faculty in range(len(self.load)):
+            need = self.need(faculty)
+            if need > 0:
+                shortfall += need
+            else:
+                overload -= need
+        return Assignment(list(self.faculty_of), shortfall, overload)
+
+def _improve(state, rng, deadline):
+    # Local search: move sections from overloaded faculty to faculty still short
+    # of their required load, and retry sections nobody could take, until a full
+    # pass finds nothing or time runs out.
+    sections = list(range(len(state.problem.sections)))
+    improved = True
+    while improved and time.monotonic() < deadline:
+        improved = False
+        rng.shuffle(sections)
+        for section in sections:
+            owner = state.faculty_of[section]
+            if owner < 0:
+                if state.year_fits(section):
+                    faculty = state.neediest_fit(section)
+                    if faculty is not None:
+                        state.place(faculty, section)
+                        improved = True
+                continue
+            owner_need = state.need(owner)
+            if owner_need >= 0:
+                continue
+            units = state.problem.sections[section][1]
+            for need in sorted(state.by_need, reverse=True):
+                gain = abs(need) + abs(owner_need) - abs(need - units) - abs(owner_need + units)
+                if gain <= 0:
+                    break
+                target = next((f for f in state.by_need[need] if f != owner and state.fits(f, section)), None)
+                if target is not None:
+                    state.unplace(section)
+                    state.place(target, section)
+                    improved = True
+                    break
+
+def solve_assignment(problem, seed=0, time_limit=60.0, initial=None):
+    """Assign each unassigned section to at most one faculty member.
+
+    Assignments never break check_schedule_conflict's rules. A randomized greedy
+    pass gives the largest sections to the faculty furthest below their required
+    load; local search then evens loads out. Passing a previous Assignment as
+    initial continues from it instead of starting over.
+    """
+    deadline = time.monotonic() + time_limit
+    rng = random.Random(seed)
+    state = _AssignmentState(problem)
+    if initial is not None:
+        for section, faculty in enumerate(initial.faculty_of):
+            if faculty >= 0:
+                state.place(faculty, section)
+        # Shake the incumbent up a little so that restarts explore different moves.
+        placed = [section for section, faculty in enumerate(state.faculty_of) if faculty >= 0]
+        for section in rng.sample(placed, len(placed) // 20):
+            state.unplace(section)
+    order = [section for section, faculty in enumerate(state.faculty_of) if faculty < 0]
+    order.sort(key=lambda section: (-problem.sections[section][1], rng.random()))
+    for section in order:
+        if time.monotonic() >= deadline:
+            break
+        if state.year_fits(section):
+            faculty = state.neediest_fit(section)
+            if faculty is not None:
+                state.place(faculty, section)
+    _improve(state, rng, deadline)
+    return state.result()
+
+# Below this many offerings a single process finishes before a pool would start.
+PARALLEL_SOLVER_THRESHOLD = 2000
+
+# Set in each worker process by _init_solver_worker so the problem is pickled
+# once per worker rather than once per restart.
+_worker_problem = None
+
+def _init_solver_worker(problem):
+    global _worker_problem
+    _worker_problem = problem
+
+def _solve_restart(seed, time_limit, initial):
+    return solve_assignment(_worker_problem, seed=seed, time_limit=time_limit, initial=initial)
+
+def solve_assignment_parallel(problem, workers=None, restarts=None, rounds=2, time_limit=60.0, seed=0):
+    """Run randomized restarts of solve_assignment across a process pool.
+
+    Every round runs `restarts` seeds (default: one per worker); the best
+    assignment of a round becomes the incumbent that all restarts of the next
+    round continue from.
+    """
+    workers = workers or os.cpu_count() or 1
+    restarts = restarts or workers
+    deadline = time.monotonic() + time_limit
+    best = None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_solver_worker, initargs=(problem,)) as pool:
+        for round_number in range(rounds):
+            # The first round always runs, so there is an assignment to return
+            # even when the time limit is already spent.
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 and best is not None:
+                break
+            futures = [pool.submit(_solve_restart, seed + round_number * restarts + k, max(remaining, 0), best)
+                       for k in range(restarts)]
+            for future in futures:
+                candidate = future.result()
+                if best is None or candidate.score() < best.score():
+                    best = candidate
+    return best
@@ -0,0 +1,427 @@
+"""SQLite connections, schema migrations and change tracking."""
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+from .models import Course, Faculty, parse_schedule
+from .timing import TIMINGS
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'faculty_workload.db'
+
+# Pragmas applied to every connection opened by connect_database. Entries can be
+# overridden per call; a value of None leaves SQLite's default in place.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',       # readers no longer block the writer
+    'synchronous': 'NORMAL',     # WAL stays consistent; fsync only at checkpoints
+    'cache_size': -16000,        # negative means KiB, so about 16 MB of page cache
+    'mmap_size': 268435456,      # map up to 256 MB of the file for reads
+    'temp_store': 'MEMORY',
+}
+
+def connect_database(path=DATABASE_PATH, pragmas=None):
+    settings = dict(SQLITE_PRAGMAS)
+    settings.update(pragmas or {})
+    connection = sqlite3.connect(path)
+    for name, value in settings.items():
+        if value is not None:
+            connection.execute(f"PRAGMA {name} = {value}")
+    return connection
+
+def _create_base_tables(cursor):
+    # Databases created before versioning already have these tables.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS faculty (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            classification TEXT NOT NULL,
+            is_admin BOOLEAN NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS courses (
+            id INTEGER PRIMARY KEY,
+            faculty_id INTEGER,
+            name TEXT NOT NULL,
+            year_level TEXT NOT NULL,
+            units INTEGER NOT NULL,
+            schedule TEXT NOT NULL,
+            FOREIGN KEY (faculty_id) REFERENCES faculty (id)
+        )
+    ''')
+
+def _add_lookup_indexes(cursor):
+    # Fold duplicate faculty names into the oldest row before making names unique.
+    # The dropped rows' classification and admin status are lost, so each merge
+    # is logged.
+    merged = cursor.execute('''
+        SELECT f.id, f.name, f.classification, f.is_admin, keep.id,
+               (SELECT COUNT(*) FROM courses WHERE faculty_id = f.id)
+        FROM faculty f
+        JOIN faculty keep ON keep.id = (SELECT MIN(id) FROM faculty WHERE name = f.name)
+        WHERE f.id != keep.id
+        ORDER BY f.name, f.id
+    ''').fetchall()
+    for id, name, classification, is_admin, keep_id, courses in merged:
+        logger.warning(f"Merging duplicate faculty {name!r}: row {id} ({classification}, "
+                       f"{'admin' if is_admin else 'not admin'}) and its {courses} courses folded into row {keep_id}.")
+    cursor.execute('''
+        UPDATE courses SET faculty_id = (
+            SELECT MIN(keep.id) FROM faculty keep
+            WHERE keep.name = (SELECT name FROM faculty WHERE id = courses.faculty_id)
+        )
+        WHERE faculty_id IN (SELECT id FROM faculty)
+    ''')
+    cursor.execute("DELETE FROM faculty WHERE id NOT IN (SELECT MIN(id) FROM faculty GROUP BY name)")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_faculty_name ON faculty (name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_courses_faculty_id ON courses (faculty_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_courses_year_level ON courses (year_level, schedule)")
+
+def _add_time_slot_columns(cursor):
+    cursor.execute("ALTER TABLE courses ADD COLUMN days INTEGER NOT NULL DEFAULT 0")
+    cursor.execute("ALTER TABLE courses ADD COLUMN start_minute INTEGER NOT NULL DEFAULT 0")
+    cursor.execute("ALTER TABLE courses ADD COLUMN end_minute INTEGER NOT NULL DEFAULT 0")
+    _write_time_slots(cursor, [row[0] for row in cursor.execute("SELECT DISTINCT schedule FROM courses").fetchall()])
+
+def _write_time_slots(cursor, schedules):
+    cursor.executemany(
+        "UPDATE courses SET days = ?, start_minute = ?, end_minute = ? WHERE schedule = ?",
+        [(*parse_schedule(schedule), schedule) for schedule in schedules]
+    )
+    return cursor.rowcount
+
+# Append new migrations here; PRAGMA user_version records how many have run.
+MIGRATIONS = [
+    _create_base_tables,
+    _add_lookup_indexes,
+    _add_time_slot_columns,
+]
+
+def migrate_database(connection):
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if version > len(MIGRATIONS):
+        logger.warning(f"Database schema version {version} is newer than this application ({len(MIGRATIONS)}).")
+        return
+    for target, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        logger.info(f"Migrating database schema to version {target}...")
+        cursor = connection.cursor()
+        cursor.execute("BEGIN")
+        try:
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {target}")
+        except Exception:
+            connection.rollback()
+            raise
+        connection.commit()
+
+def _check_owner_saved(course, owner):
+    # A faculty member whose insert was discarded has no id; writing the course
+    # anyway would silently turn it into an unassigned offering.
+    if owner is not None and owner.id is None:
+        raise sqlite3.IntegrityError(f"{owner.name} was not saved, so {course.name} cannot be assigned to them")
+
+def _is_transient(error):
+    # Lock contention clears up on its own; anything else fails the same way every time.
+    return isinstance(error, sqlite3.OperationalError) and ('locked' in str(error) or 'busy' in str(error))
+
+def _describe(obj):
+    return f"{type(obj).__name__.lower()} {obj.name!r}"
+
+def refresh_time_slots(connection):
+    """Re-derive the days/start_minute/end_minute columns where they disagree with the schedule text.
+
+    The text is what users edit and see, so it wins; this catches rows edited
+    outside the application. Returns the number of courses updated.
+    """
+    stale = [schedule for schedule, days, start, end in connection.execute(
+                 "SELECT DISTINCT schedule, days, start_minute, end_minute FROM courses").fetchall()
+             if parse_schedule(schedule) != (days, start, end)]
+    if not stale:
+        return 0
+    with connection:
+        updated = _write_time_slots(connection.cursor(), sorted(set(stale)))
+    logger.warning(f"Updated the time slot columns of {updated} courses to match their schedule text.")
+    return updated
+
+class UnitOfWork:
+    """Tracks new, dirty and deleted Faculty/Course objects between saves.
+
+    Only the tracked rows are written on commit, so primary keys stay stable
+    and a save costs as much as the edit rather than the whole database.
+    """
+
+    def __init__(self):
+        # Map each tracked object to the Faculty that owns it (None for faculty rows).
+        self.new = {}
+        self.dirty = {}
+        self.deleted = set()
+
+    def register_new(self, obj, owner=None):
+        self.new[obj] = owner
+
+    def register_dirty(self, obj, owner=None):
+        if obj in self.new:
+            if owner is not None:
+                self.new[obj] = owner
+        elif owner is not None or obj not in self.dirty:
+            self.dirty[obj] = owner
+
+    def register_deleted(self, obj):
+        self.dirty.pop(obj, None)
+        if obj in self.new:
+            # Never written, so there is nothing to delete.
+            del self.new[obj]
+        else:
+            # The id may still be pending on the writer thread, so it is
+            # resolved when the delete is written.
+            self.deleted.add(obj)
+
+    def has_changes(self):
+        return bool(self.new or self.dirty or self.deleted)
+
+    def take(self):
+        taken = UnitOfWork()
+        taken.new, taken.dirty, taken.deleted = self.new, self.dirty, self.deleted
+        self.new, self.dirty, self.deleted = {}, {}, set()
+        return taken
+
+    def absorb(self, other):
+        for obj, owner in other.new.items():
+            self.register_new(obj, owner)
+        for obj, owner in other.dirty.items():
+            self.register_dirty(obj, owner)
+        for obj in other.deleted:
+            self.register_deleted(obj)
+
+    def split(self):
+        """(object, UnitOfWork) for each tracked change, in the order commit writes them."""
+        units = []
+        for obj in self.deleted:
+            unit = UnitOfWork()
+            unit.deleted.add(obj)
+            units.append((obj, unit))
+        for obj, owner in sorted(self.new.items(), key=lambda item: isinstance(item[0], Course)):
+            unit = UnitOfWork()
+            unit.new[obj] = owner
+            units.append((obj, unit))
+        for obj, owner in self.dirty.items():
+            unit = UnitOfWork()
+            unit.dirty[obj] = owner
+            units.append((obj, unit))
+        return units
+
+    def commit(self, connection):
+        if not self.has_changes():
+            return
+        assigned = []
+        try:
+            with connection:
+                cursor = connection.cursor()
+                self._write_deletes(cursor)
+                self._write_inserts(cursor, assigned)
+                self._write_updates(cursor)
+        except Exception:
+            # The transaction was rolled back, so the ids handed out are void.
+            for obj in assigned:
+                obj.id = None
+            raise
+        self.new.clear()
+        self.dirty.clear()
+        self.deleted.clear()
+
+    def _write_deletes(self, cursor):
+        faculty_ids = [(obj.id,) for obj in self.deleted if isinstance(obj, Faculty) and obj.id is not None]
+        course_ids = [(obj.id,) for obj in self.deleted if isinstance(obj, Course) and obj.id is not None]
+        cursor.executemany("DELETE FROM courses WHERE id = ?", course_ids)
+        cursor.executemany("DELETE FROM courses WHERE faculty_id = ?", faculty_ids)
+        cursor.executemany("DELETE FROM faculty WHERE id = ?", faculty_ids)
+
+    def _write_inserts(self, cursor, assigned):
+        # Faculty first so that new courses can reference their owner's id.
+        for obj in self.new:
+            if isinstance(obj, Faculty):
+                cursor.execute('''
+                    INSERT INTO faculty (name, classification, is_admin)
+                    VALUES (?, ?, ?)
+                ''', (obj.name, obj.classification, obj.is_admin))
+                obj.id = cursor.lastrowid
+                assigned.append(obj)
+        for obj, owner in self.new.items():
+            if isinstance(obj, Course):
+                _check_owner_saved(obj, owner)
+                cursor.execute('''
+                    INSERT INTO courses (faculty_id, name, year_level, units, schedule, days, start_minute, end_minute)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (owner.id if owner else None, obj.name, obj.year_level, obj.units, obj.schedule, *obj.slot))
+                obj.id = cursor.lastrowid
+                assigned.append(obj)
+
+    def _write_updates(self, cursor):
+        for obj, owner in self.dirty.items():
+            if isinstance(obj, Faculty):
+                cursor.execute('''
+                    UPDATE faculty SET name = ?, classification = ?, is_admin = ?
+                    WHERE id = ?
+                ''', (obj.name, obj.classification, obj.is_admin, obj.id))
+            elif owner is not None:
+                _check_owner_saved(obj, owner)
+                cursor.execute('''
+                    UPDATE courses SET faculty_id = ?, name = ?, year_level = ?, units = ?, schedule = ?,
+                        days = ?, start_minute = ?, end_minute = ?
+                    WHERE id = ?
+                ''', (owner.id, obj.name, obj.year_level, obj.units, obj.schedule, *obj.slot, obj.id))
+            else:
+                cursor.execute('''
+                    UPDATE courses SET name = ?, year_level = ?, units = ?, schedule = ?,
+                        days = ?, start_minute = ?, end_minute = ?
+                    WHERE id = ?
+                ''', (obj.name, obj.year_level, obj.units, obj.schedule, *obj.slot, obj.id))
+
+class _FlushRequest:
+    __slots__ = ('done', 'durable')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.durable = False
+
+class DatabaseWriter:
+    """Writes queued UnitOfWork batches on a background thread.
+
+    Batches that pile up while a transaction is running are coalesced into the
+    next one. If the database is locked or busy, the changes stay pending and
+    are retried with the next submit or flush. Any other failure is narrowed
+    down by writing the changes one at a time; those that still fail are
+    discarded and reported. on_committed(batches) and on_failed(message) are
+    called on the writer thread; the window forwards them through Qt signals.
+    """
+
+    # How often a waiting flush() checks that the writer thread is still alive.
+    POLL_SECONDS = 0.5
+
+    def __init__(self, path=DATABASE_PATH, pragmas=None, on_committed=None, on_failed=None):
+        self.path = path
+        self.pragmas = pragmas
+        self.on_committed = on_committed
+        self.on_failed = on_failed
+        self._queue = queue.Queue()
+        self._pending = UnitOfWork()
+        self._discarded = False
+        self._thread = threading.Thread(target=self._run, name="DatabaseWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, unit_of_work):
+        self._queue.put(unit_of_work)
+
+    def flush(self):
+        """Wait until everything submitted so far has been written or has failed.
+
+        Returns True only if all of it was written since the last flush; False
+        also when the writer thread has stopped.
+        """
+        request = _FlushRequest()
+        self._queue.put(request)
+        while not request.done.wait(self.POLL_SECONDS):
+            if not self._thread.is_alive():
+                logger.error("The database writer has stopped; changes cannot be saved.")
+                return False
+        return request.durable
+
+    def close(self):
+        durable = self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        return durable
+
+    def _notify(self, callback, *args):
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.exception(f"Error in database writer callback: {str(e)}")
+
+    def _run(self):
+        try:
+            connection = connect_database(self.path, self.pragmas)
+        except Exception as e:
+            logger.exception(f"Error opening database for writing: {str(e)}")
+            self._notify(self.on_failed, f"The database could not be opened for writing: {e}")
+            return
+        try:
+            running = True
+            while running:
+                item = self._queue.get()
+                batches = 0
+                requests = []
+                while True:
+                    if item is None:
+                        running = False
+                    elif isinstance(item, _FlushRequest):
+                        requests.append(item)
+                    else:
+                        self._pending.absorb(item)
+                        batches += 1
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                try:
+                    self._write(connection, batches)
+                except Exception as e:
+                    logger.exception(f"Error in database writer: {str(e)}")
+                finally:
+                    # Always release waiters, whatever happened above.
+                    durable = not self._pending.has_changes() and not self._discarded
+                    if requests:
+                        self._discarded = False
+                    for request in requests:
+                        request.durable = durable
+                        request.done.set()
+            # Fold the WAL back into the database file so the close is fully durable.
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            connection.close()
+
+    def _write(self, connection, batches):
+        if not self._pending.has_changes():
+            return
+        start = time.perf_counter()
+        try:
+            self._pending.commit(connection)
+        except Exception as e:
+            if _is_transient(e):
+                logger.warning(f"Database busy, changes will be retried: {str(e)}")
+                self._notify(self.on_failed, f"The database is busy; changes will be retried ({e}).")
+                return
+            logger.error(f"Error saving to database: {str(e)}; saving the changes one at a time.")
+            failures = self._write_separately(connection)
+            if failures:
+                self._discarded = True
+                for obj, error in failures:
+                    logger.error(f"Discarded unsaveable change to {_describe(obj)}: {str(error)}")
+                self._notify(self.on_failed, "These changes could not be saved and were discarded: "
+                             + "; ".join(f"{_describe(obj)} ({error})" for obj, error in failures))
+                return
+            if self._pending.has_changes():
+                return
+        else:
+            TIMINGS.record('save', time.perf_counter() - start)
+        self._notify(self.on_committed, batches)
+
+    def _write_separately(self, connection):
+        # Each change in its own transaction, so one bad row cannot hold back
+        # the rest. Lock errors keep the change pending instead.
+        pending, self._pending = self._pending, UnitOfWork()
+        failures = []
+        for obj, unit in pending.split():
+            try:
+                unit.commit(connection)
+            except Exception as e:
+                if _is_transient(e):
+                    self._pending.absorb(unit)
+                else:
+                    failures.append((obj, e))
+        return failures
@@ -0,0 +1,108 @@
+"""Timers around the hot paths, summarised for support tickets.
+
+Each named operation keeps an exact count, total and maximum, plus its most
+recent SAMPLES_KEPT durations for the p50 and p95. Recording costs two
+perf_counter() calls and a locked append, so the timers stay on in normal use.
+The window shows them in its Performance dialog; TIMINGS.dump() writes the
+same figures as JSON.
+"""
+import collections
+import datetime
+import functools
+import json
+import math
+import platform
+import sys
+import threading
+import time
+
+SAMPLES_KEPT = 1024
+
+class Timer:
+    """Durations recorded for one operation, in seconds."""
+
+    __slots__ = ('name', 'count', 'total', 'max', 'samples')
+
+    def __init__(self, name, samples_kept=SAMPLES_KEPT):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = collections.deque(maxlen=samples_kept)
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.samples.append(seconds)
+
+    def summary(self):
+        # Nearest-rank percentiles over the retained samples.
+        ordered = sorted(self.samples)
+        def percentile(fraction):
+            return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)] if ordered else 0.0
+        return {
+            'count': self.count,
+            'p50_ms': round(percentile(0.50) * 1000, 3),
+            'p95_ms': round(percentile(0.95) * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+            'total_ms': round(self.total * 1000, 3),
+        }
+
+class Timings:
+    """Named timers shared by the service, the writer thread and the window."""
+
+    def __init__(self, samples_kept=SAMPLES_KEPT):
+        self.samples_kept = samples_kept
+        self._timers = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = Timer(name, self.samples_kept)
+            timer.record(seconds)
+
+    def timed(self, name):
+        """Decorator recording each call's duration under name, including calls that raise."""
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def summary(self):
+        with self._lock:
+            timers = [(name, Timer(name, self.samples_kept)) for name in self._timers]
+            for name, copy in timers:
+                timer = self._timers[name]
+                copy.count, copy.total, copy.max = timer.count, timer.total, timer.max
+                copy.samples.extend(timer.samples)
+        return {name: copy.summary() for name, copy in sorted(timers)}
+
+    def reset(self):
+        with self._lock:
+            self._timers.clear()
+
+    def dump(self, file_path, **context):
+        """Write the summary as JSON, with the interpreter, platform and any context given."""
+        report = {
+            'generated': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'context': context,
+            'timings': self.summary(),
+        }
+        with open(file_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+TIMINGS = Timings()
+timed = TIMINGS.timed
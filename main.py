@@ -1,29 +1,32 @@
 import sys
 import os
-import datetime
 import logging
 import tempfile
-import sqlite3
-import csv
-from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton, QTableWidget, QTableWidgetItem, QMessageBox, QFileDialog, QStyleFactory
-from PyQt5.QtCore import Qt
+import multiprocessing
+import contextlib
+from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton, QTableView, QMessageBox, QFileDialog, QStyleFactory, QDialog, QDialogButtonBox, QListWidget, QTableWidget, QTableWidgetItem, QHeaderView
+from PyQt5.QtCore import Qt, QObject, QAbstractTableModel, QModelIndex, pyqtSignal
 from PyQt5.QtGui import QFont, QPalette, QColor
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Spacer
-
-def write_debug(message):
-    home_dir = os.path.expanduser('~')
-    log_path = os.path.join(home_dir, 'faculty_app_debug.log')
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(log_path, 'a') as f:
-        f.write(f"{timestamp} - {message}\n")
-
-write_debug("Application starting...")
-write_debug(f"Python version: {sys.version}")
-write_debug(f"Current working directory: {os.getcwd()}")
-write_debug(f"Executable path: {sys.executable}")
-write_debug(f"sys.path: {sys.path}")
+from facload import cli
+from facload.diagnostics import start_logging
+from facload.models import CLASSIFICATIONS, SCHEDULES, UNITS, YEAR_LEVELS, Course
+from facload.service import WorkloadService
+from facload.storage import DATABASE_PATH
+from facload.timing import TIMINGS, timed
+
+logger = logging.getLogger('facload.app')
+
+def log_startup_diagnostics():
+    # Off by default; set FACULTY_APP_DIAGNOSTICS=1 to record the environment at launch.
+    logger.info("Application starting...")
+    logger.info(f"Python version: {sys.version}")
+    logger.info(f"Current working directory: {os.getcwd()}")
+    logger.info(f"Executable path: {sys.executable}")
+    logger.info(f"sys.path: {sys.path}")
+    logger.info(f"Home directory: {os.path.expanduser('~')}")
+    custom_temp_dir = configure_temp_dir()
+    logger.info(f"Temporary directory exists: {os.path.exists(custom_temp_dir)}")
+    logger.info(f"Temporary directory permissions: {oct(os.stat(custom_temp_dir).st_mode)[-3:]}")
 
 def get_temp_dir():
     if getattr(sys, 'frozen', False):
@@ -37,83 +40,223 @@ def get_temp_dir():
     try:
         os.makedirs(custom_temp_dir, exist_ok=True)
     except Exception as e:
-        write_debug(f"Error creating temp directory: {str(e)}")
+        logger.exception(f"Error creating temp directory: {str(e)}")
         custom_temp_dir = tempfile.gettempdir()
     
     return custom_temp_dir
 
-custom_temp_dir = get_temp_dir()
-os.environ['TMPDIR'] = custom_temp_dir
-tempfile.tempdir = custom_temp_dir
-
-write_debug(f"Custom temporary directory: {custom_temp_dir}")
-write_debug(f"Temporary directory exists: {os.path.exists(custom_temp_dir)}")
-write_debug(f"Temporary directory permissions: {oct(os.stat(custom_temp_dir).st_mode)[-3:]}")
-
-write_debug("All modules imported successfully")
-
-# Log some initial information
-logging.debug(f"Current working directory: {os.getcwd()}")
-logging.debug(f"Home directory: {os.path.expanduser('~')}")
-logging.debug(f"Temporary directory: {tempfile.gettempdir()}")
-
-class Course:
-    def __init__(self, name, year_level, units, schedule):
-        self.name = name
-        self.year_level = year_level
-        self.units = units
-        self.schedule = schedule
-
-class Faculty:
-    def __init__(self, name, classification, is_admin=False):
-        self.name = name
-        self.classification = classification
-        self.is_admin = is_admin
-        self.courses = []
-        self.required_load = self.calculate_required_load()
-
-    def calculate_required_load(self):
-        if self.classification == "Full-time PhD":
-            return 15 - (12 if self.is_admin else 0)
-        elif self.classification == "Full-time MA":
-            return 18 - (12 if self.is_admin else 0)
-        else:  # Part-time
-            return 0
-
-    def current_load(self):
-        return sum(course.units for course in self.courses)
-
-    def load_status(self):
-        current = self.current_load()
-        if current < self.required_load:
-            return f"Below required ({self.required_load - current} units short)"
-        elif current > self.required_load:
-            return f"Overload ({current - self.required_load} units excess)"
-        else:
-            return "Satisfied"
+_custom_temp_dir = None
+
+def configure_temp_dir():
+    # Point temporary files (reportlab's among them) at get_temp_dir(). Done on
+    # first use rather than at import so that launching touches no directories.
+    global _custom_temp_dir
+    if _custom_temp_dir is None:
+        _custom_temp_dir = get_temp_dir()
+        os.environ['TMPDIR'] = _custom_temp_dir
+        tempfile.tempdir = _custom_temp_dir
+        logger.info(f"Custom temporary directory: {_custom_temp_dir}")
+    return _custom_temp_dir
+
+class FacultyTableModel(QAbstractTableModel):
+    HEADERS = ["Name", "Classification", "Admin", "Current Load", "Status"]
+
+    def __init__(self, faculty_list, parent=None):
+        super().__init__(parent)
+        self.reset(faculty_list)
+
+    def reset(self, faculty_list):
+        self.beginResetModel()
+        self.faculty_list = faculty_list
+        self._rows = {faculty: row for row, faculty in enumerate(faculty_list)}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.faculty_list)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        faculty = self.faculty_list[index.row()]
+        column = index.column()
+        if column == 0:
+            return faculty.name
+        if column == 1:
+            return faculty.classification
+        if column == 2:
+            return "Yes" if faculty.is_admin else "No"
+        if column == 3:
+            return str(faculty.current_load())
+        return faculty.load_status()
+
+    # The service edits the shared list; wrap the edit in appending() so views
+    # hear about the new row before and after it is added.
+    @contextlib.contextmanager
+    def appending(self):
+        row = len(self.faculty_list)
+        self.beginInsertRows(QModelIndex(), row, row)
+        try:
+            yield
+        finally:
+            self._rows.update((faculty, index) for index, faculty in enumerate(self.faculty_list[row:], row))
+            self.endInsertRows()
+
+    def faculty_changed(self, faculty):
+        row = self._rows.get(faculty)
+        if row is not None:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+class CourseTableModel(QAbstractTableModel):
+    HEADERS = ["Faculty", "Course", "Year", "Units", "Schedule"]
+
+    def __init__(self, faculty_list, unassigned, parent=None):
+        super().__init__(parent)
+        self.rebuild(faculty_list, unassigned)
+
+    def rebuild(self, faculty_list, unassigned):
+        self.beginResetModel()
+        self.rows = [course for faculty in faculty_list for course in faculty.courses]
+        self.rows.extend(unassigned)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        course = self.rows[index.row()]
+        column = index.column()
+        if column == 0:
+            return course.faculty.name if course.faculty else "(unassigned)"
+        if column == 1:
+            return course.name
+        if column == 2:
+            return course.year_level
+        if column == 3:
+            return str(course.units)
+        return course.schedule
+
+    def append(self, course):
+        row = len(self.rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.append(course)
+        self.endInsertRows()
+
+class AlternativesDialog(QDialog):
+    def __init__(self, course, alternatives, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Schedule Conflict")
+        self.alternatives = alternatives
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel(f"{course.name} ({course.year_level}, {course.schedule}) conflicts with an existing schedule.\n"
+                                "Pick an alternative to add it there instead:"))
+        self.options = QListWidget()
+        self.options.addItems([alternative.label for alternative in alternatives])
+        self.options.setCurrentRow(0)
+        self.options.itemDoubleClicked.connect(self.accept)
+        layout.addWidget(self.options)
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.button(QDialogButtonBox.Ok).setText("Apply")
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+    def selected(self):
+        return self.alternatives[self.options.currentRow()]
+
+class PerformanceDialog(QDialog):
+    COLUMNS = [("Operation", None), ("Count", 'count'), ("p50 (ms)", 'p50_ms'), ("p95 (ms)", 'p95_ms'),
+               ("Max (ms)", 'max_ms'), ("Total (ms)", 'total_ms')]
+
+    def __init__(self, service, parent=None):
+        super().__init__(parent)
+        self.service = service
+        self.setWindowTitle("Performance")
+        self.resize(640, 400)
+        layout = QVBoxLayout()
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([label for label, _ in self.COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.addButton("Refresh", QDialogButtonBox.ActionRole).clicked.connect(self.refresh)
+        buttons.addButton("Reset", QDialogButtonBox.ResetRole).clicked.connect(self.reset)
+        buttons.addButton("Save JSON...", QDialogButtonBox.ActionRole).clicked.connect(self.save_json)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+        self.refresh()
+
+    def refresh(self):
+        summary = TIMINGS.summary()
+        self.table.setRowCount(len(summary))
+        for row, (name, figures) in enumerate(summary.items()):
+            for column, (_, key) in enumerate(self.COLUMNS):
+                item = QTableWidgetItem(name if key is None else str(figures[key]))
+                if key is not None:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+    def reset(self):
+        TIMINGS.reset()
+        self.refresh()
+
+    def save_json(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Timings", "faculty_app_timings.json", "JSON Files (*.json)")
+        if file_path:
+            try:
+                TIMINGS.dump(file_path, faculty=len(self.service.faculty_list),
+                             courses=sum(len(faculty.courses) for faculty in self.service.faculty_list),
+                             unassigned=len(self.service.unassigned_courses))
+                logger.info(f"Timings saved to: {file_path}")
+            except Exception as e:
+                logger.exception(f"Error saving timings: {str(e)}")
+                QMessageBox.critical(self, "Save Failed", f"An error occurred while saving the timings: {str(e)}")
+
+class WriterSignals(QObject):
+    # Carries DatabaseWriter callbacks from its thread to the GUI thread.
+    committed = pyqtSignal(int)
+    failed = pyqtSignal(str)
 
 class FacultyWorkloadApp(QMainWindow):
-    def __init__(self):
-        write_debug("Initializing FacultyWorkloadApp...")
+    def __init__(self, database_path=DATABASE_PATH, pragmas=None):
+        logger.debug("Initializing FacultyWorkloadApp...")
         super().__init__()
-        write_debug("Setting up UI...")
+        logger.debug("Setting up UI...")
         self.setWindowTitle("Faculty Workload and Scheduling Application")
         self.setGeometry(100, 100, 1000, 800)
-        self.faculty_list = []
-        write_debug("Connecting to database...")
-        self.db_connection = sqlite3.connect('faculty_workload.db')
-        write_debug("Creating tables...")
-        self.create_tables()
-        write_debug("Loading data from database...")
-        self.load_data_from_db()
-        write_debug("Initializing UI...")
+        self.writer_signals = WriterSignals(self)
+        self.writer_signals.committed.connect(self.on_data_saved)
+        self.writer_signals.failed.connect(self.on_save_failed)
+        self.service = WorkloadService(database_path, on_committed=self.writer_signals.committed.emit,
+                                       on_failed=self.writer_signals.failed.emit, pragmas=pragmas)
+        logger.debug("Initializing UI...")
         self.initUI()
-        write_debug("Setting dark theme...")
+        logger.debug("Setting dark theme...")
         self.set_dark_theme()
-        write_debug("FacultyWorkloadApp initialization complete.")
+        logger.debug("FacultyWorkloadApp initialization complete.")
 
     def set_dark_theme(self):
-        write_debug("Setting dark theme...")
+        logger.debug("Setting dark theme...")
         app = QApplication.instance()
         app.setStyle(QStyleFactory.create("Fusion"))
         palette = QPalette()
@@ -131,63 +274,16 @@ class FacultyWorkloadApp(QMainWindow):
         palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
         palette.setColor(QPalette.HighlightedText, Qt.black)
         app.setPalette(palette)
-        write_debug("Dark theme set.")
-
-    def create_tables(self):
-        cursor = self.db_connection.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS faculty (
-                id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL,
-                classification TEXT NOT NULL,
-                is_admin BOOLEAN NOT NULL
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS courses (
-                id INTEGER PRIMARY KEY,
-                faculty_id INTEGER,
-                name TEXT NOT NULL,
-                year_level TEXT NOT NULL,
-                units INTEGER NOT NULL,
-                schedule TEXT NOT NULL,
-                FOREIGN KEY (faculty_id) REFERENCES faculty (id)
-            )
-        ''')
-        self.db_connection.commit()
-
-    def load_data_from_db(self):
-        cursor = self.db_connection.cursor()
-        cursor.execute("SELECT * FROM faculty")
-        faculty_data = cursor.fetchall()
-        for faculty in faculty_data:
-            f = Faculty(faculty[1], faculty[2], faculty[3])
-            cursor.execute("SELECT * FROM courses WHERE faculty_id = ?", (faculty[0],))
-            courses_data = cursor.fetchall()
-            for course in courses_data:
-                c = Course(course[2], course[3], course[4], course[5])
-                f.courses.append(c)
-            self.faculty_list.append(f)
-
-    def save_data_to_db(self):
-        cursor = self.db_connection.cursor()
-        cursor.execute("DELETE FROM faculty")
-        cursor.execute("DELETE FROM courses")
-        for faculty in self.faculty_list:
-            cursor.execute('''
-                INSERT INTO faculty (name, classification, is_admin)
-                VALUES (?, ?, ?)
-            ''', (faculty.name, faculty.classification, faculty.is_admin))
-            faculty_id = cursor.lastrowid
-            for course in faculty.courses:
-                cursor.execute('''
-                    INSERT INTO courses (faculty_id, name, year_level, units, schedule)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (faculty_id, course.name, course.year_level, course.units, course.schedule))
-        self.db_connection.commit()
+        logger.debug("Dark theme set.")
+
+    def on_data_saved(self, batches):
+        self.statusBar().showMessage("All changes saved.", 3000)
+
+    def on_save_failed(self, message):
+        QMessageBox.warning(self, "Save Failed", message)
 
     def initUI(self):
-        write_debug("Starting initUI...")
+        logger.debug("Starting initUI...")
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
         layout = QVBoxLayout()
@@ -196,7 +292,7 @@ class FacultyWorkloadApp(QMainWindow):
         faculty_layout = QHBoxLayout()
         self.faculty_name_input = QLineEdit()
         self.faculty_classification = QComboBox()
-        self.faculty_classification.addItems(["Full-time PhD", "Full-time MA", "Part-time"])
+        self.faculty_classification.addItems(CLASSIFICATIONS)
         self.is_admin_checkbox = QComboBox()
         self.is_admin_checkbox.addItems(["Not Admin", "Admin"])
         add_faculty_button = QPushButton("Add Faculty")
@@ -216,16 +312,11 @@ class FacultyWorkloadApp(QMainWindow):
         course_layout = QHBoxLayout()
         self.course_name_input = QLineEdit()
         self.year_level = QComboBox()
-        self.year_level.addItems(["BA 1", "BA 2", "BA 3", "BA 4", "MA 1", "MA 2"])
+        self.year_level.addItems(YEAR_LEVELS)
         self.units = QComboBox()
-        self.units.addItems(["3", "6"])
+        self.units.addItems([str(units) for units in UNITS])
         self.schedule = QComboBox()
-        self.schedule.addItems([
-            "MW 07:40am-09:10am", "MW 09:20am-10:50am", "MW 12:25pm-01:55pm", "MW 02:05pm-03:35pm",
-            "TTh 07:40am-09:10am", "TTh 09:20am-10:50am", "TTh 12:25pm-01:55pm", "TTh 02:05pm-03:35pm",
-            "TTh 03:45pm-05:15pm", "TTh 05:50pm-07:20pm", "TTh 07:30pm-09:00pm",
-            "Sat 09:00am-12:00pm", "Sat 01:00pm-04:00pm", "Sat 05:00pm-08:00pm"
-        ])
+        self.schedule.addItems(SCHEDULES)
         self.faculty_select = QComboBox()
         add_course_button = QPushButton("Add Course")
         add_course_button.clicked.connect(self.add_course)
@@ -245,15 +336,15 @@ class FacultyWorkloadApp(QMainWindow):
         layout.addLayout(course_layout)
 
         # Faculty Workload Table
-        self.faculty_table = QTableWidget()
-        self.faculty_table.setColumnCount(5)
-        self.faculty_table.setHorizontalHeaderLabels(["Name", "Classification", "Admin", "Current Load", "Status"])
+        self.faculty_model = FacultyTableModel(self.service.faculty_list, self)
+        self.faculty_table = QTableView()
+        self.faculty_table.setModel(self.faculty_model)
         layout.addWidget(self.faculty_table)
 
         # Course Schedule Table
-        self.course_table = QTableWidget()
-        self.course_table.setColumnCount(5)
-        self.course_table.setHorizontalHeaderLabels(["Faculty", "Course", "Year", "Units", "Schedule"])
+        self.course_model = CourseTableModel(self.service.faculty_list, self.service.unassigned_courses, self)
+        self.course_table = QTableView()
+        self.course_table.setModel(self.course_model)
         layout.addWidget(self.course_table)
 
         # Export Buttons
@@ -264,31 +355,39 @@ class FacultyWorkloadApp(QMainWindow):
         export_csv_button.clicked.connect(self.export_csv)
         export_layout.addWidget(export_pdf_button)
         export_layout.addWidget(export_csv_button)
+        import_csv_button = QPushButton("Import CSV")
+        import_csv_button.clicked.connect(self.import_csv)
+        export_layout.addWidget(import_csv_button)
+        auto_assign_button = QPushButton("Auto-Assign Offerings")
+        auto_assign_button.clicked.connect(self.auto_assign)
+        export_layout.addWidget(auto_assign_button)
+        audit_button = QPushButton("Audit Conflicts")
+        audit_button.clicked.connect(self.audit_conflicts)
+        export_layout.addWidget(audit_button)
+        performance_button = QPushButton("Performance")
+        performance_button.clicked.connect(self.show_performance)
+        export_layout.addWidget(performance_button)
         layout.addLayout(export_layout)
 
         central_widget.setLayout(layout)
 
-        self.update_faculty_table()
-        self.update_course_table()
         self.update_faculty_select()
 
-        write_debug("initUI complete.")
+        logger.debug("initUI complete.")
 
     def add_faculty(self):
-        name = self.faculty_name_input.text()
+        name = self.faculty_name_input.text().strip()
         classification = self.faculty_classification.currentText()
         is_admin = self.is_admin_checkbox.currentText() == "Admin"
         
         if name:
-            if any(f.name == name for f in self.faculty_list):
+            if self.service.find_faculty(name):
                 QMessageBox.warning(self, "Input Error", "A faculty member with this name already exists.")
             else:
-                faculty = Faculty(name, classification, is_admin)
-                self.faculty_list.append(faculty)
-                self.update_faculty_table()
+                with self.faculty_model.appending():
+                    self.service.add_faculty(name, classification, is_admin)
                 self.update_faculty_select()
                 self.faculty_name_input.clear()
-                self.save_data_to_db()
         else:
             QMessageBox.warning(self, "Input Error", "Please enter a faculty name.")
 
@@ -300,199 +399,173 @@ class FacultyWorkloadApp(QMainWindow):
         faculty_name = self.faculty_select.currentText()
 
         if course_name and faculty_name:
+            # A probe in the default store until assign_course adds it to the roster.
             course = Course(course_name, year_level, units, schedule)
-            faculty = next((f for f in self.faculty_list if f.name == faculty_name), None)
+            faculty = self.service.find_faculty(faculty_name)
             
             if faculty:
-                if self.check_schedule_conflict(faculty, course):
-                    QMessageBox.warning(self, "Schedule Conflict", "This course conflicts with the faculty's existing schedule.")
+                if self.service.check_schedule_conflict(faculty, course):
+                    self.resolve_conflict(faculty, course)
                 else:
-                    faculty.courses.append(course)
-                    self.update_faculty_table()
-                    self.update_course_table()
-                    self.course_name_input.clear()
-                    self.save_data_to_db()
+                    self.assign_course(faculty, course)
             else:
                 QMessageBox.warning(self, "Faculty Not Found", "Selected faculty not found.")
         else:
             QMessageBox.warning(self, "Input Error", "Please enter all course details and select a faculty.")
 
-    def check_schedule_conflict(self, faculty, new_course):
-        # Check for conflicts within the same faculty's schedule
-        for course in faculty.courses:
-            if course.schedule == new_course.schedule:
-                return True
-            if course.year_level == new_course.year_level and course.schedule.split()[0] == new_course.schedule.split()[0]:
-                return True
-        
-        # Check for conflicts with other faculty members' schedules
-        for other_faculty in self.faculty_list:
-            if other_faculty != faculty:  # Skip the current faculty
-                for course in other_faculty.courses:
-                    if course.year_level == new_course.year_level and course.schedule == new_course.schedule:
-                        return True
-        
-        return False
-
+    def assign_course(self, faculty, course):
+        course = self.service.assign_course(faculty, course)
+        self.faculty_model.faculty_changed(faculty)
+        self.course_model.append(course)
+        self.course_name_input.clear()
+
+    def resolve_conflict(self, faculty, course):
+        alternatives = self.service.suggest_alternatives(faculty, course)
+        if not alternatives:
+            QMessageBox.warning(self, "Schedule Conflict", "This course conflicts with the faculty's existing schedule.")
+            return
+        dialog = AlternativesDialog(course, alternatives, self)
+        if dialog.exec_() == QDialog.Accepted:
+            choice = dialog.selected()
+            course.schedule = choice.schedule
+            self.assign_course(choice.faculty, course)
+
+    # Full refreshes, for bulk changes; single additions update the models in place.
+    @timed('refresh.faculty_table')
     def update_faculty_table(self):
-        self.faculty_table.setRowCount(len(self.faculty_list))
-        for row, faculty in enumerate(self.faculty_list):
-            self.faculty_table.setItem(row, 0, QTableWidgetItem(faculty.name))
-            self.faculty_table.setItem(row, 1, QTableWidgetItem(faculty.classification))
-            self.faculty_table.setItem(row, 2, QTableWidgetItem("Yes" if faculty.is_admin else "No"))
-            self.faculty_table.setItem(row, 3, QTableWidgetItem(str(faculty.current_load())))
-            self.faculty_table.setItem(row, 4, QTableWidgetItem(faculty.load_status()))
+        self.faculty_model.reset(self.service.faculty_list)
 
+    @timed('refresh.course_table')
     def update_course_table(self):
-        courses = [course for faculty in self.faculty_list for course in faculty.courses]
-        self.course_table.setRowCount(len(courses))
-        for row, course in enumerate(courses):
-            faculty = next(f for f in self.faculty_list if course in f.courses)
-            self.course_table.setItem(row, 0, QTableWidgetItem(faculty.name))
-            self.course_table.setItem(row, 1, QTableWidgetItem(course.name))
-            self.course_table.setItem(row, 2, QTableWidgetItem(course.year_level))
-            self.course_table.setItem(row, 3, QTableWidgetItem(str(course.units)))
-            self.course_table.setItem(row, 4, QTableWidgetItem(course.schedule))
+        self.course_model.rebuild(self.service.faculty_list, self.service.unassigned_courses)
 
+    @timed('refresh.faculty_select')
     def update_faculty_select(self):
         self.faculty_select.clear()
-        self.faculty_select.addItems([faculty.name for faculty in self.faculty_list])
+        self.faculty_select.addItems([faculty.name for faculty in self.service.faculty_list])
 
     def export_pdf(self):
-        write_debug("Starting PDF export...")
+        logger.debug("Starting PDF export...")
         file_path, _ = QFileDialog.getSaveFileName(self, "Save PDF", "", "PDF Files (*.pdf)")
         if file_path:
-            write_debug(f"Saving PDF to: {file_path}")
+            logger.info(f"Saving PDF to: {file_path}")
             try:
-                doc = SimpleDocTemplate(file_path, pagesize=letter)
-                elements = []
-
-                # Faculty Table
-                write_debug("Creating faculty table...")
-                faculty_data = [["Name", "Classification", "Admin", "Current Load", "Status"]]
-                for faculty in self.faculty_list:
-                    faculty_data.append([
-                        faculty.name,
-                        faculty.classification,
-                        "Yes" if faculty.is_admin else "No",
-                        str(faculty.current_load()),
-                        faculty.load_status()
-                    ])
-                faculty_table = Table(faculty_data)
-                faculty_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 14),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 12),
-                    ('TOPPADDING', (0, 1), (-1, -1), 6),
-                    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                elements.append(faculty_table)
-                write_debug("Adding Spacer...")
-                elements.append(Spacer(1, 20))
-
-                # Course Table
-                write_debug("Creating course table...")
-                course_data = [["Faculty", "Course", "Year", "Units", "Schedule"]]
-                for faculty in self.faculty_list:
-                    for course in faculty.courses:
-                        course_data.append([
-                            faculty.name,
-                            course.name,
-                            course.year_level,
-                            str(course.units),
-                            course.schedule
-                        ])
-                course_table = Table(course_data)
-                course_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 14),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 12),
-                    ('TOPPADDING', (0, 1), (-1, -1), 6),
-                    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                elements.append(course_table)
-
-                write_debug("Building PDF...")
-                doc.build(elements)
-                write_debug("PDF export completed successfully.")
+                configure_temp_dir()
+                self.service.write_pdf(file_path)
+                logger.info("PDF export completed successfully.")
                 QMessageBox.information(self, "Export Successful", f"Data exported to PDF: {file_path}")
             except Exception as e:
-                write_debug(f"Error during PDF export: {str(e)}")
+                logger.exception(f"Error during PDF export: {str(e)}")
                 QMessageBox.critical(self, "Export Failed", f"An error occurred while exporting to PDF: {str(e)}")
 
     def export_csv(self):
-        write_debug("Starting CSV export...")
+        logger.debug("Starting CSV export...")
         file_path, _ = QFileDialog.getSaveFileName(self, "Save CSV", "", "CSV Files (*.csv)")
         if file_path:
-            write_debug(f"Saving CSV to: {file_path}")
+            logger.info(f"Saving CSV to: {file_path}")
             try:
-                with open(file_path, 'w', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(["Faculty Information"])
-                    writer.writerow(["Name", "Classification", "Admin", "Current Load", "Status"])
-                    for faculty in self.faculty_list:
-                        writer.writerow([
-                            faculty.name,
-                            faculty.classification,
-                            "Yes" if faculty.is_admin else "No",
-                            faculty.current_load(),
-                            faculty.load_status()
-                        ])
-                    writer.writerow([])
-                    writer.writerow(["Course Information"])
-                    writer.writerow(["Faculty", "Course", "Year", "Units", "Schedule"])
-                    for faculty in self.faculty_list:
-                        for course in faculty.courses:
-                            writer.writerow([
-                                faculty.name,
-                                course.name,
-                                course.year_level,
-                                course.units,
-                                course.schedule
-                            ])
-                write_debug("CSV export completed successfully.")
+                self.service.write_csv(file_path)
+                logger.info("CSV export completed successfully.")
                 QMessageBox.information(self, "Export Successful", f"Data exported to CSV: {file_path}")
             except Exception as e:
-                write_debug(f"Error during CSV export: {str(e)}")
+                logger.exception(f"Error during CSV export: {str(e)}")
                 QMessageBox.critical(self, "Export Failed", f"An error occurred while exporting to CSV: {str(e)}")
 
+    def import_csv(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Import CSV", "", "CSV Files (*.csv)")
+        if file_path:
+            self.import_csv_file(file_path)
+
+    def import_csv_file(self, file_path):
+        try:
+            result = self.service.import_csv(file_path)
+        except Exception as e:
+            logger.exception(f"Error during CSV import: {str(e)}")
+            QMessageBox.critical(self, "Import Failed", f"An error occurred while importing the CSV: {str(e)}")
+            return
+        self.update_faculty_table()
+        self.update_course_table()
+        self.update_faculty_select()
+        summary = (f"Imported {len(result.faculty)} faculty and {len(result.courses)} courses."
+                   f" {len(result.issues)} rows were rejected.")
+        if result.issues:
+            box = QMessageBox(QMessageBox.Warning, "Import Finished", summary, QMessageBox.Ok, self)
+            box.setDetailedText("\n".join(f"Line {issue.line}: {issue.message}" for issue in result.issues))
+            box.exec_()
+        else:
+            QMessageBox.information(self, "Import Finished", summary)
+
+    def auto_assign(self):
+        offerings = len(self.service.unassigned_courses)
+        solution = self.service.auto_assign()
+        if solution is None:
+            QMessageBox.information(self, "Auto-Assign", "There are no unassigned offerings.")
+            return
+        remaining = solution.unplaced
+        self.update_faculty_table()
+        self.update_course_table()
+        QMessageBox.information(self, "Auto-Assign", (
+            f"Assigned {offerings - remaining} of {offerings} offerings."
+            f" {remaining} could not be placed without a conflict.\n"
+            f"Remaining shortfall: {solution.shortfall} units. Overload: {solution.overload} units."
+        ))
+
+    def audit_conflicts(self):
+        try:
+            conflicts = self.service.audit()
+        except Exception as e:
+            logger.exception(f"Error during conflict audit: {str(e)}")
+            QMessageBox.critical(self, "Audit Failed", f"An error occurred while auditing conflicts: {str(e)}")
+            return
+        if conflicts:
+            box = QMessageBox(QMessageBox.Warning, "Audit Finished", f"{len(conflicts)} conflicts found.", QMessageBox.Ok, self)
+            box.setDetailedText("\n".join(conflict.describe() for conflict in conflicts))
+            box.exec_()
+        else:
+            QMessageBox.information(self, "Audit Finished", "No schedule conflicts found.")
+
+    def show_performance(self):
+        PerformanceDialog(self.service, self).exec_()
+
     def closeEvent(self, event):
-        write_debug("Closing application...")
-        self.save_data_to_db()
-        self.db_connection.close()
-        write_debug("Application closed.")
+        logger.debug("Closing application...")
+        while not self.service.flush():
+            answer = QMessageBox.question(
+                self, "Unsaved Changes",
+                "Some changes could not be saved. Retry saving them, discard them and close, or keep the window open?",
+                QMessageBox.Retry | QMessageBox.Discard | QMessageBox.Cancel, QMessageBox.Retry
+            )
+            if answer == QMessageBox.Cancel:
+                event.ignore()
+                return
+            if answer == QMessageBox.Discard:
+                logger.warning("Closing with unsaved changes discarded.")
+                break
+        self.service.close()
+        logger.info("Application closed.")
         super().closeEvent(event)
 
 if __name__ == "__main__":
+    # Needed for the solver's process pool in frozen (PyInstaller) builds.
+    multiprocessing.freeze_support()
+    start_logging()
+    if len(sys.argv) > 1 and sys.argv[1] == "--audit":
+        # Headless: python main.py --audit [database], kept for frozen builds
+        # that only ship this entry point; same as python -m facload audit.
+        sys.exit(cli.main([f'--database={database}' for database in sys.argv[2:3]] + ['audit']))
+    if os.environ.get('FACULTY_APP_DIAGNOSTICS'):
+        log_startup_diagnostics()
     try:
-        write_debug("Creating application instance...")
+        logger.debug("Creating application instance...")
         app = QApplication(sys.argv)
-        write_debug("Creating main window...")
+        logger.debug("Creating main window...")
         ex = FacultyWorkloadApp()
-        write_debug("Showing main window...")
+        logger.debug("Showing main window...")
         ex.show()
-        write_debug("Entering main event loop...")
-        sys.exit(app.exec_())
+        logger.debug("Entering main event loop...")
+        status = app.exec_()
+        logger.debug("Application ending...")
+        sys.exit(status)
     except Exception as e:
-        write_debug(f"Error in main execution: {str(e)}")
+        logger.exception(f"Error in main execution: {str(e)}")
         raise
-
-write_debug("Application ending...")
\ No newline at end of file
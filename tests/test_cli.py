@@ -0,0 +1,38 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from facload import cli
+from facload.diagnostics import stop_logging
+
+class CommandLineTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.database = os.path.join(directory.name, 'cli.db')
+        self.feed = os.path.join(directory.name, 'faculty.csv')
+        with open(self.feed, 'w') as f:
+            f.write("Name,Classification,Admin\nAlice,Part-time,No\n")
+        environment = mock.patch.dict(os.environ, {'FACULTY_APP_LOG': os.path.join(directory.name, 'cli.log')})
+        environment.start()
+        self.addCleanup(environment.stop)
+        self.addCleanup(stop_logging)
+
+    def run_cli(self, *argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            status = cli.main(['--database', self.database, *argv])
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_unexpected_error_exits_with_error_status(self):
+        self.assertEqual(self.run_cli('import', self.feed)[0], cli.EXIT_OK)
+        with mock.patch.object(cli, '_report', side_effect=KeyError('boom')):
+            status, _, stderr = self.run_cli('report')
+        self.assertEqual(status, cli.EXIT_ERROR)
+        self.assertIn("KeyError", stderr)
+
+if __name__ == '__main__':
+    unittest.main()
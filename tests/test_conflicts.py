@@ -0,0 +1,83 @@
+import random
+import unittest
+
+import numpy as np
+
+from facload.conflicts import BUCKETS_PER_DAY, WEEK_DAYS, ConflictIndex, OccupancyMatrix, slot_buckets
+from facload.models import SCHEDULES, YEAR_LEVELS, Course, Faculty
+
+# Year levels outside YEAR_LEVELS turn up in hand-edited and generated databases.
+EXTRA_YEAR_LEVELS = ["BA 5", "MA 3"]
+SCHEDULE_TEXTS = SCHEDULES + ["MWF 08:00am-09:00am", "Th 09:00am-10:30am", "M 07:00am-12:00pm", "not a schedule"]
+
+def reference_conflicts(placed, faculty, course):
+    # check_schedule_conflict's rules, one pair of courses at a time.
+    slot = course.slot
+    for owner, other in placed:
+        shares_day = bool(slot.days & other.slot.days)
+        if other.year_level == course.year_level and slot.overlaps(other.slot):
+            return True
+        if faculty is not None and owner is faculty and shares_day:
+            if other.year_level == course.year_level or slot.overlaps(other.slot):
+                return True
+    return False
+
+class RandomizedIndexTest(unittest.TestCase):
+    def random_course(self, rng):
+        return Course("Course", rng.choice(YEAR_LEVELS + EXTRA_YEAR_LEVELS), 3, rng.choice(SCHEDULE_TEXTS))
+
+    def random_placements(self, rng, faculty, count):
+        placed = []
+        for _ in range(count):
+            if placed and rng.random() < 0.3:
+                yield 'remove', placed.pop(rng.randrange(len(placed))), placed
+            else:
+                placement = (rng.choice(faculty + [None]), self.random_course(rng))
+                placed.append(placement)
+                yield 'add', placement, placed
+
+    def test_conflict_index_matches_pairwise_rules(self):
+        for seed in range(20):
+            rng = random.Random(seed)
+            faculty = [Faculty(f"Faculty {i}", "Part-time") for i in range(5)]
+            index = ConflictIndex()
+            for action, (owner, course), placed in self.random_placements(rng, faculty, 60):
+                getattr(index, action)(owner, course)
+                for _ in range(5):
+                    probe_owner, probe = rng.choice(faculty + [None]), self.random_course(rng)
+                    self.assertEqual(index.conflicts(probe_owner, probe), reference_conflicts(placed, probe_owner, probe),
+                                     f"seed {seed}: {probe_owner and probe_owner.name} {probe.year_level} {probe.schedule}")
+
+    def test_occupancy_matrix_matches_bucket_counts(self):
+        for seed in range(20):
+            rng = random.Random(seed)
+            faculty = [Faculty(f"Faculty {i}", "Part-time") for i in range(5)]
+            matrix = OccupancyMatrix()
+            for action, (owner, course), placed in self.random_placements(rng, faculty, 60):
+                getattr(matrix, action)(owner, course)
+            expected_years = {}
+            expected_faculty = {member: np.zeros(WEEK_DAYS * BUCKETS_PER_DAY, dtype=int) for member in faculty}
+            for owner, course in placed:
+                row = expected_years.setdefault(course.year_level, np.zeros(WEEK_DAYS * BUCKETS_PER_DAY, dtype=int))
+                np.add.at(row, slot_buckets(course.slot), 1)
+                if owner is not None:
+                    np.add.at(expected_faculty[owner], slot_buckets(course.slot), 1)
+            for year_level, row in matrix.year_rows.items():
+                expected = expected_years.get(year_level, np.zeros(WEEK_DAYS * BUCKETS_PER_DAY, dtype=int))
+                np.testing.assert_array_equal(matrix.years[row], expected, f"seed {seed}: {year_level}")
+            for member, row in matrix.faculty_rows.items():
+                np.testing.assert_array_equal(matrix.faculty[row], expected_faculty[member], f"seed {seed}: {member.name}")
+            probe = rng.choice(SCHEDULES)
+            busy = {owner for owner, course in placed
+                    if owner is not None and np.intersect1d(slot_buckets(course.slot), slot_buckets(Course("Probe", "BA 1", 3, probe).slot)).size}
+            self.assertEqual(set(matrix.free_faculty(probe)), set(matrix.faculty_rows) - busy)
+
+    def test_unknown_year_level_is_added(self):
+        course = Course("Capstone", "BA 5", 3, SCHEDULES[0])
+        matrix = OccupancyMatrix([], [course])
+        self.assertFalse(matrix.year_level_free("BA 5", SCHEDULES[0]))
+        self.assertTrue(matrix.year_level_free("BA 5", SCHEDULES[1]))
+        self.assertEqual(len(matrix.years), len(YEAR_LEVELS) + 1)
+
+if __name__ == '__main__':
+    unittest.main()
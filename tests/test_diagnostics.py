@@ -0,0 +1,35 @@
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from facload.diagnostics import logger, start_logging, stop_logging
+
+class StartLoggingTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'app.log')
+        self.addCleanup(stop_logging)
+
+    def read_log(self):
+        stop_logging()
+        with open(self.path) as f:
+            return f.read()
+
+    def test_unknown_level_falls_back_to_info(self):
+        with mock.patch.dict(os.environ, {'FACULTY_APP_LOG_LEVEL': 'verbose'}):
+            start_logging(self.path)
+        self.assertEqual(logger.level, logging.INFO)
+        self.assertIn("Unknown log level 'verbose'", self.read_log())
+
+    def test_explicit_level_wins_over_environment(self):
+        with mock.patch.dict(os.environ, {'FACULTY_APP_LOG_LEVEL': 'DEBUG'}):
+            self.assertIsNone(start_logging(self.path, level='OFF'))
+            self.assertGreater(logger.level, logging.CRITICAL)
+            start_logging(self.path, level='WARNING')
+        self.assertEqual(logger.level, logging.WARNING)
+
+if __name__ == '__main__':
+    unittest.main()
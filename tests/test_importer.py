@@ -0,0 +1,98 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from facload.audit import audit_conflicts
+from facload.importer import BulkImporter
+from facload.models import Course
+from facload.service import WorkloadService
+from facload.storage import connect_database, migrate_database
+
+COURSE_FIELDS = ["Faculty", "Classification", "Course", "Year", "Units", "Schedule"]
+
+class BulkImporterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_feed(self, rows):
+        path = os.path.join(self.directory.name, 'courses.csv')
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=COURSE_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def course_row(self, faculty, course, schedule='MW 07:40am-09:10am', year='BA 1'):
+        return {"Faculty": faculty, "Classification": "Full-time PhD", "Course": course,
+                "Year": year, "Units": "3", "Schedule": schedule}
+
+    def test_new_faculty_rows_are_checked_for_year_level_clashes(self):
+        path = self.write_feed([self.course_row("Alice", "Accounting"),
+                                self.course_row("Carol", "Economics"),
+                                self.course_row("Dan", "Finance")])
+        result = BulkImporter([]).read(path)
+        self.assertEqual([faculty.name for faculty in result.faculty], ["Alice"])
+        self.assertEqual([course.name for _, course in result.courses], ["Accounting"])
+        self.assertEqual([issue.line for issue in result.issues], [3, 4])
+
+    def test_imported_feed_audits_clean(self):
+        path = self.write_feed([self.course_row("Alice", "Accounting"),
+                                self.course_row("Carol", "Economics"),
+                                self.course_row("Carol", "Marketing", schedule='MW 09:20am-10:50am'),
+                                self.course_row("Dan", "Finance", year='BA 2')])
+        connection = connect_database(os.path.join(self.directory.name, 'import.db'))
+        self.addCleanup(connection.close)
+        migrate_database(connection)
+        importer = BulkImporter([])
+        result = importer.read(path)
+        importer.write(connection, result)
+        self.assertEqual(len(result.courses), 3)
+        self.assertEqual(sorted(faculty.name for faculty in result.faculty), ["Alice", "Carol", "Dan"])
+        self.assertEqual(audit_conflicts(connection), [])
+
+    def test_byte_order_mark_is_ignored(self):
+        path = self.write_feed([self.course_row("Alice", "Accounting")])
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        with open(path, 'w', encoding='utf-8-sig') as f:
+            f.write(text)
+        result = BulkImporter([]).read(path)
+        self.assertEqual([(faculty.name, course.name) for faculty, course in result.courses], [("Alice", "Accounting")])
+
+    def test_course_feed_without_faculty_column_is_rejected(self):
+        path = os.path.join(self.directory.name, 'offerings.csv')
+        with open(path, 'w', newline='') as f:
+            f.write("Course,Year,Units,Schedule\nAccounting,BA 1,3,MW 07:40am-09:10am\n")
+        result = BulkImporter([]).read(path)
+        self.assertEqual(result.courses, [])
+        self.assertEqual([issue.line for issue in result.issues], [1])
+
+    def test_csv_export_imports_into_an_empty_database(self):
+        source = WorkloadService(os.path.join(self.directory.name, 'source.db'))
+        self.addCleanup(source.close)
+        alice = source.add_faculty("Alice", "Full-time MA", is_admin=True)
+        source.assign_course(alice, Course("Accounting", "BA 1", 3, "MW 07:40am-09:10am"))
+        source.import_csv(self.write_feed([self.course_row("", "Economics", year='BA 2')]))
+        export = os.path.join(self.directory.name, 'export.csv')
+        source.write_csv(export)
+        target = WorkloadService(os.path.join(self.directory.name, 'target.db'))
+        self.addCleanup(target.close)
+        result = target.import_csv(export)
+        self.assertEqual(result.issues, [])
+        self.assertEqual([(faculty.name, faculty.classification, faculty.is_admin) for faculty in target.faculty_list],
+                         [("Alice", "Full-time MA", True)])
+        self.assertEqual([course.name for course in target.faculty_list[0].courses], ["Accounting"])
+        self.assertEqual([course.name for course in target.unassigned_courses], ["Economics"])
+
+    def test_unknown_faculty_without_classification_is_rejected(self):
+        path = os.path.join(self.directory.name, 'plain.csv')
+        with open(path, 'w', newline='') as f:
+            f.write("Faculty,Course,Year,Units,Schedule\nEve,Accounting,BA 1,3,MW 07:40am-09:10am\n")
+        result = BulkImporter([]).read(path)
+        self.assertEqual(result.faculty, [])
+        self.assertEqual(result.issues[0].message, "Faculty 'Eve' not found.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import gc
+import random
+import unittest
+from collections import Counter
+
+from facload.models import SCHEDULES, UNITS, YEAR_LEVELS, Course, CourseStore, Faculty
+
+class RandomizedCourseStoreTest(unittest.TestCase):
+    def test_totals_match_live_courses(self):
+        for seed in range(20):
+            rng = random.Random(seed)
+            store = CourseStore()
+            faculty = [Faculty(f"Faculty {i}", "Part-time") for i in range(6)]
+            courses = []
+            for step in range(300):
+                action = rng.random()
+                if action < 0.5 or not courses:
+                    course = Course(f"Course {step}", rng.choice(YEAR_LEVELS + ["BA 5"]), rng.choice(UNITS),
+                                    rng.choice(SCHEDULES), store=store)
+                    courses.append(course)
+                    if rng.random() < 0.7:
+                        rng.choice(faculty).add_course(course)
+                elif action < 0.7:
+                    # Reassign, or hand back to the offerings.
+                    course = rng.choice(courses)
+                    if course.faculty is not None:
+                        course.faculty.remove_course(course)
+                    if rng.random() < 0.5:
+                        rng.choice(faculty).add_course(course)
+                elif action < 0.85:
+                    course = courses.pop(rng.randrange(len(courses)))
+                    if course.faculty is not None:
+                        course.faculty.remove_course(course)
+                    del course
+                else:
+                    course = rng.choice(courses)
+                    course.units = rng.choice(UNITS)
+                    if course.faculty is not None:
+                        course.faculty.invalidate_load()
+            gc.collect()
+            self.assertEqual(len(store), len(courses))
+            self.assertEqual(store.faculty_loads(faculty).tolist(), [member.current_load() for member in faculty])
+            units, counts, schedules = Counter(), Counter(), Counter()
+            for course in courses:
+                units[course.year_level] += course.units
+                counts[course.year_level] += 1
+                schedules[course.schedule] += 1
+            self.assertEqual(store.year_level_units(), {key: value for key, value in units.items() if value})
+            self.assertEqual(store.year_level_counts(), dict(counts))
+            self.assertEqual(store.schedule_counts(), dict(schedules))
+            self.assertEqual(store.unassigned_units(), sum(course.units for course in courses if course.faculty is None))
+
+    def test_collected_faculty_frees_their_row(self):
+        store = CourseStore()
+        faculty = Faculty("Alice", "Part-time")
+        course = Course("Accounting", "BA 1", 3, SCHEDULES[0], store=store)
+        faculty.add_course(course)
+        faculty.remove_course(course)
+        del faculty
+        gc.collect()
+        self.assertEqual(len(store.faculty_rows), 0)
+        bob = Faculty("Bob", "Part-time")
+        bob.add_course(course)
+        self.assertEqual(store.faculty_loads([bob]).tolist(), [3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from facload.models import Course
+from facload.service import WorkloadService
+
+class CourseTotalsTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'service.db')
+        self.service = self.open_service(self.path)
+        self.faculty = self.service.add_faculty("Alice", "Full-time PhD")
+
+    def open_service(self, path):
+        service = WorkloadService(path)
+        self.addCleanup(service.close)
+        return service
+
+    def test_totals_cover_only_this_roster(self):
+        probe = Course("Accounting", "BA 1", 3, "MW 07:40am-09:10am")
+        course = self.service.assign_course(self.faculty, probe)
+        self.assertIsNot(course, probe)
+        self.assertIs(course.store, self.service.course_store)
+        pending = Course("Economics", "BA 2", 3, "MW 07:40am-09:10am")
+        other = self.open_service(os.path.join(os.path.dirname(self.path), 'other.db'))
+        other.assign_course(other.add_faculty("Bob", "Part-time"), Course("Finance", "BA 1", 3, "TTh 07:40am-09:10am"))
+        totals = self.service.course_totals()
+        self.assertEqual(totals.year_level_counts, {"BA 1": 1})
+        self.assertEqual(totals.schedule_counts, {"MW 07:40am-09:10am": 1})
+        self.assertEqual(totals.unassigned_units, 0)
+        self.assertEqual(pending.name, "Economics")
+
+    def test_alternatives_do_not_touch_the_store(self):
+        self.service.assign_course(self.faculty, Course("Accounting", "BA 1", 3, "MW 07:40am-09:10am"))
+        rows = len(self.service.course_store)
+        alternatives = self.service.suggest_alternatives(self.faculty, Course("Economics", "BA 1", 3, "MW 07:40am-09:10am"))
+        self.assertTrue(alternatives)
+        self.assertEqual(len(self.service.course_store), rows)
+
+class PragmasTest(unittest.TestCase):
+    def test_pragmas_reach_both_connections(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        service = WorkloadService(os.path.join(directory.name, 'pragmas.db'), pragmas={'cache_size': -2000})
+        self.addCleanup(service.close)
+        self.assertEqual(service.connection.execute("PRAGMA cache_size").fetchone(), (-2000,))
+        self.assertEqual(service.writer.pragmas, {'cache_size': -2000})
+
+if __name__ == '__main__':
+    unittest.main()
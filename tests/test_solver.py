@@ -0,0 +1,16 @@
+import unittest
+
+from facload.models import SCHEDULES, YEAR_LEVELS, Course, Faculty
+from facload.solver import AssignmentProblem, solve_assignment_parallel
+
+class ParallelSolverTest(unittest.TestCase):
+    def test_spent_time_limit_still_returns_an_assignment(self):
+        faculty = [Faculty(f"Faculty {i}", "Part-time") for i in range(4)]
+        offerings = [Course(f"Course {i}", YEAR_LEVELS[i % len(YEAR_LEVELS)], 3, SCHEDULES[i % len(SCHEDULES)])
+                     for i in range(40)]
+        solution = solve_assignment_parallel(AssignmentProblem(faculty, offerings), workers=2, time_limit=0)
+        self.assertIsNotNone(solution)
+        self.assertEqual(len(solution.faculty_of), len(offerings))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from facload.models import Course, Faculty
+from facload.audit import audit_conflicts
+from facload.storage import (MIGRATIONS, DatabaseWriter, UnitOfWork, connect_database, migrate_database,
+                             refresh_time_slots)
+
+class DatabaseWriterTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'writer.db')
+        connection = connect_database(self.path)
+        migrate_database(connection)
+        connection.execute("INSERT INTO faculty (name, classification, is_admin) VALUES ('Zed', 'Part-time', 0)")
+        connection.commit()
+        connection.close()
+        self.failures = []
+
+    def submit(self, writer, *objects):
+        unit_of_work = UnitOfWork()
+        for obj, owner in objects:
+            unit_of_work.register_new(obj, owner)
+        writer.submit(unit_of_work)
+
+    def faculty_names(self):
+        connection = sqlite3.connect(self.path)
+        try:
+            return sorted(row[0] for row in connection.execute("SELECT name FROM faculty"))
+        finally:
+            connection.close()
+
+    def test_rejected_change_does_not_block_later_saves(self):
+        writer = DatabaseWriter(self.path, on_failed=self.failures.append)
+        zed = Faculty("Zed", "Part-time")
+        bob = Faculty("Bob", "Part-time")
+        self.submit(writer, (zed, None), (Course("Orphan", "BA 1", 3, "MW 07:40am-09:10am"), zed), (bob, None))
+        self.assertFalse(writer.flush())
+        self.assertEqual(len(self.failures), 1)
+        self.assertIn("'Zed'", self.failures[0])
+        self.assertIn("'Orphan'", self.failures[0])
+        self.submit(writer, (Faculty("Cy", "Part-time"), None))
+        self.assertTrue(writer.flush())
+        self.assertTrue(writer.close())
+        self.assertEqual(len(self.failures), 1)
+        self.assertEqual(self.faculty_names(), ["Bob", "Cy", "Zed"])
+        self.assertIsNone(zed.id)
+
+    def test_locked_database_is_retried(self):
+        writer = DatabaseWriter(self.path, pragmas={'busy_timeout': 0}, on_failed=self.failures.append)
+        blocker = sqlite3.connect(self.path)
+        blocker.execute("BEGIN IMMEDIATE")
+        self.submit(writer, (Faculty("Bob", "Part-time"), None))
+        self.assertFalse(writer.flush())
+        blocker.rollback()
+        blocker.close()
+        self.assertTrue(writer.flush())
+        writer.close()
+        self.assertEqual(self.faculty_names(), ["Bob", "Zed"])
+
+    def test_raising_callback_does_not_hang_flush(self):
+        def on_committed(batches):
+            raise RuntimeError("callback failed")
+        writer = DatabaseWriter(self.path, on_committed=on_committed)
+        self.submit(writer, (Faculty("Bob", "Part-time"), None))
+        self.assertTrue(writer.flush())
+        self.assertTrue(writer.close())
+
+    def test_writer_that_cannot_connect_does_not_hang_flush(self):
+        writer = DatabaseWriter(os.path.join(self.path, 'missing', 'writer.db'), on_failed=self.failures.append)
+        self.submit(writer, (Faculty("Bob", "Part-time"), None))
+        self.assertFalse(writer.flush())
+        self.assertFalse(writer.close())
+        self.assertEqual(len(self.failures), 1)
+
+class MigrationTest(unittest.TestCase):
+    def test_merged_duplicate_faculty_are_logged(self):
+        connection = sqlite3.connect(':memory:')
+        self.addCleanup(connection.close)
+        MIGRATIONS[0](connection.cursor())
+        connection.execute("PRAGMA user_version = 1")
+        connection.execute("INSERT INTO faculty VALUES (1, 'A', 'Full-time PhD', 0), (2, 'A', 'Full-time MA', 1)")
+        connection.execute("INSERT INTO courses VALUES (1, 2, 'Accounting', 'BA 1', 3, 'MW 07:40am-09:10am')")
+        connection.commit()
+        with self.assertLogs('facload.storage', 'WARNING') as logs:
+            migrate_database(connection)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("row 2 (Full-time MA, admin) and its 1 courses folded into row 1", logs.output[0])
+        self.assertEqual(connection.execute("SELECT faculty_id FROM courses").fetchall(), [(1,)])
+
+    def test_hand_edited_schedule_refreshes_time_slot_columns(self):
+        connection = connect_database(':memory:')
+        self.addCleanup(connection.close)
+        migrate_database(connection)
+        connection.execute("INSERT INTO faculty (id, name, classification, is_admin) VALUES (1, 'A', 'Part-time', 0)")
+        connection.execute('''
+            INSERT INTO courses (faculty_id, name, year_level, units, schedule, days, start_minute, end_minute)
+            VALUES (1, 'Accounting', 'BA 1', 3, 'MW 07:40am-09:10am', 5, 460, 550),
+                   (1, 'Economics', 'BA 2', 3, 'MW 09:20am-10:50am', 5, 560, 650)
+        ''')
+        connection.commit()
+        self.assertEqual(refresh_time_slots(connection), 0)
+        self.assertEqual(audit_conflicts(connection), [])
+        # Edited outside the application: the text changes, the columns do not.
+        connection.execute("UPDATE courses SET schedule = 'MW 08:00am-09:30am' WHERE name = 'Economics'")
+        connection.commit()
+        with self.assertLogs('facload.storage', 'WARNING'):
+            self.assertEqual(refresh_time_slots(connection), 1)
+        self.assertEqual(connection.execute("SELECT start_minute FROM courses WHERE name = 'Economics'").fetchone(), (480,))
+        self.assertEqual([conflict.kind for conflict in audit_conflicts(connection)], ["Faculty double-booking"])
+
+if __name__ == '__main__':
+    unittest.main()